@@ -0,0 +1,102 @@
+# benchmarks/bench_copies.py
+"""
+Allocation check for the DataCleaning pipelines under copy-on-write.
+
+Each composite clean_* pipeline runs on a synthetic frame with copy-on-write
+disabled and then enabled. The check reports the tracemalloc peak as a multiple
+of the input size (the number of full-frame copies alive at once) and fails if
+copy-on-write does not reduce or match it.
+
+Run from the repository root, as a report or as a test:
+    python -m benchmarks.bench_copies --rows 100000
+    python -m pytest benchmarks/bench_copies.py
+"""
+
+import argparse
+import copy
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.golden_harness import make_cards, make_orders, make_products, make_stores, make_users
+from data_cleaning import DataCleaning
+
+PIPELINES = {
+    'clean_user_data': make_users,
+    'clean_card_details': make_cards,
+    'clean_store_details': make_stores,
+    'clean_product_data': make_products,
+    'clean_orders_data': make_orders,
+}
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def traced_peak(method_name: str, df: pd.DataFrame, copy_on_write: bool) -> int:
+    """
+    Return the traced peak allocation, in bytes, of one pipeline run on a private copy of `df`.
+    """
+    data = copy.deepcopy(df)
+    cleaner = DataCleaning()
+    with pd.option_context('mode.copy_on_write', copy_on_write):
+        tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            getattr(cleaner, method_name)(data)
+            return tracemalloc.get_traced_memory()[1] - start
+        finally:
+            tracemalloc.stop()
+
+
+def measure(rows: int) -> list:
+    """
+    Return (pipeline, input bytes, peak without copy-on-write, peak with it) for every pipeline.
+    """
+    results = []
+    for method_name, make_input in PIPELINES.items():
+        df = make_input(rows)
+        results.append((
+            method_name,
+            frame_bytes(df),
+            traced_peak(method_name, df, copy_on_write=False),
+            traced_peak(method_name, df, copy_on_write=True),
+        ))
+    return results
+
+
+def regressions(results: list) -> list:
+    return [
+        f"{method_name}: copy-on-write peak {peak_on / 1024 ** 2:.1f} MiB > legacy {peak_off / 1024 ** 2:.1f} MiB"
+        for method_name, _, peak_off, peak_on in results
+        if peak_on > peak_off
+    ]
+
+
+def test_copy_on_write_does_not_raise_peak():
+    problems = regressions(measure(rows=20_000))
+    assert not problems, "\n".join(problems)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=50_000)
+    args = parser.parse_args()
+
+    results = measure(args.rows)
+    print(f"{'pipeline':<22}{'input MiB':>11}{'peak off':>10}{'peak on':>9}{'copies off':>12}{'copies on':>11}")
+    for method_name, size, peak_off, peak_on in results:
+        print(f"{method_name:<22}{size / 1024 ** 2:>11.1f}{peak_off / 1024 ** 2:>10.1f}"
+              f"{peak_on / 1024 ** 2:>9.1f}{peak_off / size:>12.2f}{peak_on / size:>11.2f}")
+
+    problems = regressions(results)
+    for problem in problems:
+        print(problem)
+    print("copy-on-write peak <= legacy peak for every pipeline:", not problems)
+    raise SystemExit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
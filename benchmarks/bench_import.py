@@ -0,0 +1,62 @@
+# benchmarks/bench_import.py
+"""
+Import-time benchmark for the pipeline entry point.
+
+Compares the startup cost of the previous eager imports (everything main.py
+used to import at module level, plus the config reads) with importing the
+current main.py and with the imports each individual stage actually needs.
+
+Run from the repository root:
+    python -m benchmarks.bench_import --repeat 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+EAGER_IMPORTS = (
+    "import configparser, yaml, requests, pandas, pkg_resources, boto3, tabula, sqlalchemy; "
+    "import database_connector, data_extractor, data_cleaning; "
+    "configparser.ConfigParser().read('config.ini'); yaml.safe_load(open('api_conn.yaml'))"
+)
+
+CASES = {
+    "eager (previous main.py)": EAGER_IMPORTS,
+    "import main": "import main",
+    "stage users/orders": "import main, database_connector, data_extractor, data_cleaning",
+    "stage stores": "import main, pandas, database_connector, data_extractor, data_cleaning, store_snapshot",
+    "stage cards": "import main, database_connector, data_extractor, data_cleaning, tabula",
+    "stage products": "import main, database_connector, data_extractor, data_cleaning, boto3",
+}
+
+
+def time_snippet(snippet: str, repeat: int) -> float:
+    """
+    Return the median wall time, in seconds, of running `snippet` in a fresh interpreter.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", snippet], capture_output=True)
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return float("nan")
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = time_snippet("pass", args.repeat)
+    print(f"{'case':<28}{'median (s)':>12}{'over bare python (s)':>24}")
+    for name, snippet in CASES.items():
+        elapsed = time_snippet(snippet, args.repeat)
+        print(f"{name:<28}{elapsed:>12.3f}{elapsed - baseline:>24.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+# benchmarks/bench_load.py
+"""
+Extract and load throughput against a throwaway local database.
+
+Starts a private Postgres cluster (initdb and pg_ctl on a temporary directory
+and a free port), or falls back to a SQLite file when the Postgres binaries are
+not available, seeds synthetic `legacy_users` and `orders_table` sources, and
+times the pipeline's own extract and load paths:
+
+    extract      read_rds_table vs. read_rds_table_chunks, per chunk size
+    load         upload_to_db (to_sql) vs. copy_to_db (COPY), per chunk size
+    concurrency  several tables loaded at once through one connector, per pool size
+
+COPY and the concurrent loads need Postgres and are skipped on SQLite. The same
+Postgres bed backs a test of the LoadManager swap with the `modelling.sql` keys
+in place (skipped without the Postgres binaries or as root). The
+engine opens overflow connections beyond its pool size, so the pool size mostly
+decides how many connections are kept and reused between loads. The results
+are printed and written as a Markdown table, one row per measurement.
+
+Run from the repository root:
+    python -m benchmarks.bench_load --rows 100000 --output load_results.md
+    python -m pytest benchmarks/bench_load.py
+    python -m benchmarks.bench_load --pg-bin /usr/lib/postgresql/16/bin --chunksizes 10000 50000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import yaml
+from sqlalchemy import text
+
+from benchmarks.golden_harness import make_orders, make_users
+from data_extractor import DataExtractor
+from database_connector import DatabaseConnector
+from load_manager import LoadManager
+
+SOURCES = {
+    'legacy_users': make_users,
+    'orders_table': make_orders,
+}
+
+
+def find_pg_bin(pg_bin: str = None) -> str:
+    """
+    Locate the directory holding initdb and pg_ctl: the given one, the PATH,
+    or `pg_config --bindir`. Returns None if Postgres is not installed.
+    """
+    if pg_bin:
+        return pg_bin
+    initdb = shutil.which('initdb')
+    if initdb:
+        return os.path.dirname(initdb)
+    if shutil.which('pg_config'):
+        bindir = subprocess.run(['pg_config', '--bindir'], capture_output=True, text=True).stdout.strip()
+        if os.path.exists(os.path.join(bindir, 'initdb')):
+            return bindir
+    return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def local_postgres(pg_bin: str):
+    """
+    Run a throwaway Postgres cluster for the duration of the block.
+
+    The cluster uses trust authentication, listens on localhost only and runs
+    with fsync off; it is deleted on exit.
+
+    Yields:
+        str: Path to a credentials YAML file for DatabaseConnector.
+    """
+    workdir = tempfile.mkdtemp(prefix='bench_load_')
+    data_dir = os.path.join(workdir, 'data')
+    port = free_port()
+    try:
+        subprocess.run(
+            [os.path.join(pg_bin, 'initdb'), '-D', data_dir, '-U', 'postgres', '-A', 'trust', '--no-sync'],
+            check=True, capture_output=True,
+        )
+        subprocess.run(
+            [os.path.join(pg_bin, 'pg_ctl'), '-D', data_dir, '-w', '-l', os.path.join(workdir, 'postgres.log'),
+             '-o', f"-p {port} -k {workdir} -c listen_addresses=localhost -c fsync=off", 'start'],
+            check=True, capture_output=True,
+        )
+        try:
+            yield write_creds(workdir, {
+                'RDS_HOST': 'localhost',
+                'RDS_PORT': port,
+                'RDS_USER': 'postgres',
+                'RDS_PASSWORD': '',
+                'RDS_DATABASE': 'postgres',
+            })
+        finally:
+            subprocess.run(
+                [os.path.join(pg_bin, 'pg_ctl'), '-D', data_dir, '-m', 'immediate', 'stop'],
+                capture_output=True,
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def local_sqlite():
+    """
+    Use a temporary SQLite file as the stand-in database.
+
+    Yields:
+        str: Path to a credentials YAML file for DatabaseConnector.
+    """
+    workdir = tempfile.mkdtemp(prefix='bench_load_')
+    try:
+        yield write_creds(workdir, {'DB_URL': f"sqlite:///{os.path.join(workdir, 'bench.db')}"})
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def write_creds(directory: str, creds: dict) -> str:
+    path = os.path.join(directory, 'creds.yaml')
+    with open(path, 'w') as f:
+        yaml.safe_dump(creds, f)
+    return path
+
+
+def seed(db_connector: DatabaseConnector, rows: int, backend: str):
+    """
+    Create the synthetic source tables with `rows` rows each.
+    """
+    for table_name, make in SOURCES.items():
+        df = make(rows=rows).astype(str)
+        if backend == 'postgres':
+            db_connector.copy_to_db(df, table_name, if_exists='replace')
+        else:
+            df.to_sql(table_name, db_connector.engine, if_exists='replace', index=False)
+
+
+def best_of(repeat: int, func) -> float:
+    """
+    Return the fastest of `repeat` timed calls, with the connector's progress prints silenced.
+    """
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def result(backend, benchmark, method, rows, seconds, chunksize=None, pool_size=None) -> dict:
+    return {
+        'backend': backend,
+        'benchmark': benchmark,
+        'method': method,
+        'chunksize': chunksize if chunksize is not None else '-',
+        'pool_size': pool_size if pool_size is not None else '-',
+        'rows': rows,
+        'seconds': round(seconds, 3),
+        'rows_per_s': int(rows / seconds) if seconds else 0,
+    }
+
+
+def bench_extract(creds, backend, rows, chunksizes, repeat) -> list:
+    data_extractor = DataExtractor(DatabaseConnector(creds))
+    results = []
+    for table_name in SOURCES:
+        seconds = best_of(repeat, lambda: data_extractor.read_rds_table(table_name))
+        results.append(result(backend, f'extract {table_name}', 'read_rds_table', rows, seconds))
+        for chunksize in chunksizes:
+            seconds = best_of(repeat, lambda: sum(
+                len(chunk) for chunk in data_extractor.read_rds_table_chunks(table_name, chunksize=chunksize)
+            ))
+            results.append(result(backend, f'extract {table_name}', 'read_rds_table_chunks', rows, seconds,
+                                  chunksize=chunksize))
+    return results
+
+
+def bench_load(creds, backend, df, chunksizes, repeat) -> list:
+    db_connector = DatabaseConnector(creds)
+    rows = len(df)
+    results = []
+
+    seconds = best_of(repeat, lambda: db_connector.upload_to_db(df, 'bench_orders'))
+    results.append(result(backend, 'load orders', 'upload_to_db (to_sql)', rows, seconds))
+    if backend != 'postgres':
+        return results
+
+    def copy_in_chunks(chunksize):
+        db_connector.copy_to_db(df.head(0), 'bench_orders', if_exists='replace')
+        for start in range(0, rows, chunksize):
+            db_connector.copy_to_db(df.iloc[start:start + chunksize], 'bench_orders')
+
+    seconds = best_of(repeat, lambda: db_connector.copy_to_db(df, 'bench_orders', if_exists='replace'))
+    results.append(result(backend, 'load orders', 'copy_to_db (COPY)', rows, seconds))
+    for chunksize in chunksizes:
+        seconds = best_of(repeat, lambda: copy_in_chunks(chunksize))
+        results.append(result(backend, 'load orders', 'copy_to_db (COPY)', rows, seconds, chunksize=chunksize))
+    return results
+
+
+def bench_concurrency(creds, backend, df, tables, pool_sizes, repeat) -> list:
+    if backend != 'postgres':
+        return []
+
+    results = []
+    for pool_size in pool_sizes:
+        db_connector = DatabaseConnector(creds, pool_size=pool_size)
+
+        def load_all():
+            with ThreadPoolExecutor(max_workers=tables) as executor:
+                list(executor.map(
+                    lambda i: db_connector.copy_to_db(df, f'bench_orders_{i}', if_exists='replace'),
+                    range(tables),
+                ))
+
+        seconds = best_of(repeat, load_all)
+        results.append(result(backend, f'load {tables} tables at once', 'copy_to_db (COPY)',
+                              len(df) * tables, seconds, pool_size=pool_size))
+        db_connector.engine.dispose()
+    return results
+
+
+def swap_tables(db_connector: DatabaseConnector, tables: dict) -> bool:
+    loader = LoadManager(db_connector)
+    for table_name, df in tables.items():
+        loader.add(df, table_name)
+    return loader.commit()
+
+
+def test_swap_keeps_modelling_constraints():
+    import pytest
+
+    pg_bin = find_pg_bin()
+    if not pg_bin or (hasattr(os, 'geteuid') and os.geteuid() == 0):
+        pytest.skip("needs the Postgres binaries and a non-root user")
+
+    users = make_users(rows=200)[['user_uuid']]
+    orders = make_orders(rows=400)[['date_uuid']].assign(user_uuid=users['user_uuid'].repeat(2).values)
+    orphaned = orders.assign(user_uuid=make_orders(rows=400, seed=1)['user_uuid'])
+
+    with local_postgres(pg_bin) as creds:
+        db_connector = DatabaseConnector(creds)
+        assert swap_tables(db_connector, {'dim_users': users, 'orders_table': orders})
+        with db_connector.engine.begin() as connection:
+            # The modelling.sql keys, with dim_users listed before orders_table in the swap.
+            connection.execute(text(
+                "ALTER TABLE dim_users ALTER COLUMN user_uuid TYPE UUID USING user_uuid::UUID, "
+                "ADD PRIMARY KEY (user_uuid)"
+            ))
+            connection.execute(text(
+                "ALTER TABLE orders_table ALTER COLUMN user_uuid TYPE UUID USING user_uuid::UUID, "
+                "ADD CONSTRAINT fk_user_uuid FOREIGN KEY (user_uuid) REFERENCES dim_users(user_uuid)"
+            ))
+
+        for _ in range(2):
+            assert swap_tables(db_connector, {'dim_users': users, 'orders_table': orders})
+        assert not swap_tables(db_connector, {'dim_users': users, 'orders_table': orphaned})
+
+        with db_connector.engine.connect() as connection:
+            constraints = set(connection.execute(text(
+                "SELECT conname FROM pg_constraint WHERE conrelid IN "
+                "('dim_users'::regclass, 'orders_table'::regclass)"
+            )).scalars())
+            column_type = connection.execute(text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = 'orders_table' AND column_name = 'user_uuid'"
+            )).scalar()
+            loaded = pd.read_sql(text("SELECT user_uuid::text FROM orders_table"), connection)
+        assert constraints == {'dim_users_pkey', 'fk_user_uuid'}
+        assert column_type == 'uuid'
+        # The failed swap left the previous tables in place.
+        assert sorted(loaded['user_uuid']) == sorted(orders['user_uuid'])
+
+
+def to_markdown(results: list) -> str:
+    columns = list(results[0])
+    lines = [
+        '| ' + ' | '.join(columns) + ' |',
+        '|' + '|'.join('---' for _ in columns) + '|',
+    ]
+    lines += ['| ' + ' | '.join(str(row[column]) for column in columns) + ' |' for row in results]
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100_000, help='rows per seeded source table')
+    parser.add_argument('--chunksizes', type=int, nargs='+', default=[10_000, 50_000])
+    parser.add_argument('--pool-sizes', type=int, nargs='+', default=[1, 3, 6])
+    parser.add_argument('--tables', type=int, default=6, help='tables loaded at once in the concurrency run')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement; the fastest is kept')
+    parser.add_argument('--pg-bin', help='directory holding initdb and pg_ctl')
+    parser.add_argument('--sqlite', action='store_true', help='use SQLite even if Postgres is available')
+    parser.add_argument('--output', default='load_results.md', help='Markdown results file')
+    args = parser.parse_args()
+
+    pg_bin = None if args.sqlite else find_pg_bin(args.pg_bin)
+    if pg_bin and hasattr(os, 'geteuid') and os.geteuid() == 0:
+        print("initdb refuses to run as root; falling back to SQLite.")
+        pg_bin = None
+    backend = 'postgres' if pg_bin else 'sqlite'
+    database = local_postgres(pg_bin) if pg_bin else local_sqlite()
+
+    with database as creds:
+        print(f"Seeding {args.rows} rows per source table in a local {backend} database...")
+        seed(DatabaseConnector(creds), args.rows, backend)
+        orders = make_orders(rows=args.rows).astype(str)
+
+        results = bench_extract(creds, backend, args.rows, args.chunksizes, args.repeat)
+        results += bench_load(creds, backend, orders, args.chunksizes, args.repeat)
+        results += bench_concurrency(creds, backend, orders, args.tables, args.pool_sizes, args.repeat)
+
+    table = to_markdown(results)
+    print(table)
+    with open(args.output, 'w') as f:
+        f.write(table)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_products_csv.py
+"""
+Benchmark of the typed single-pass products CSV parse against the previous
+default-inference read followed by re-parsing prices and dates in cleaning.
+
+Run from the repository root:
+    python -m benchmarks.bench_products_csv --rows 200000
+"""
+
+import argparse
+import time
+import uuid
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import DataCleaning
+from data_extractor import DataExtractor
+
+
+def make_csv(rows: int, seed: int = 0) -> bytes:
+    """
+    Build a synthetic products CSV shaped like the S3 source, including NULL
+    rows, garbage rows and non-ISO dates, including the day-first and month/year
+    forms that only parse in DataCleaning's fallback order.
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.array(['1.6kg', '12 x 100g', '590ml', '2 l', '77g .', '453g'])
+    dates = np.array(['2018-10-22', '2017-03-05', '2019-11-30', '2018 October 22', 'October 2017 05',
+                      '2019/06/14', '03/04/2020', '25/12/2019', '05/20'])
+    frame = pd.DataFrame({
+        'product_name': [f'Product {i}' for i in range(rows)],
+        'product_price': [f'£{price:.2f}' for price in rng.uniform(1, 500, rows)],
+        'weight': weights[rng.integers(0, len(weights), rows)],
+        'category': rng.choice(['toys-and-games', 'sports-and-leisure', 'pets'], rows),
+        'EAN': rng.integers(10 ** 12, 10 ** 13, rows).astype(str),
+        'date_added': dates[rng.integers(0, len(dates), rows)],
+        'uuid': [str(uuid.UUID(int=int(i))) for i in rng.integers(0, 2 ** 63, rows)],
+        'removed': rng.choice(['Still_avaliable', 'Removed'], rows),
+        'product_code': [f'A{i % 10}-{i:07d}' for i in range(rows)],
+    })
+    frame.iloc[::5000] = 'NULL'
+    frame.iloc[1::7000] = 'XCD69KUI0K'
+    return frame.to_csv().encode('utf-8')
+
+
+def legacy_path(data: bytes) -> pd.DataFrame:
+    df = pd.read_csv(StringIO(data.decode('utf-8')))
+    return DataCleaning().clean_product_data(df)
+
+
+def typed_path(data: bytes) -> pd.DataFrame:
+    df = DataExtractor.parse_products_csv(data)
+    return DataCleaning().clean_product_data(df)
+
+
+def as_float(series: pd.Series) -> np.ndarray:
+    """
+    Convert a numeric or datetime column to float64 for comparison (NaT/NA -> NaN).
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.to_numpy(dtype='datetime64[ns]')
+        return np.where(np.isnat(values), np.nan, values.astype('int64').astype('float64'))
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    data = make_csv(args.rows)
+    print(f"CSV size: {len(data) / 1024 ** 2:.1f} MiB, {args.rows} rows")
+
+    raw_legacy, legacy_read = timed(lambda d: pd.read_csv(StringIO(d.decode('utf-8'))), data)
+    raw_typed, typed_read = timed(DataExtractor.parse_products_csv, data)
+    print(f"{'read only':<16}{'legacy (s)':>12}{'typed (s)':>12}")
+    print(f"{'':<16}{legacy_read:>12.3f}{typed_read:>12.3f}")
+    print(f"object columns after read: legacy {sum(raw_legacy.dtypes == object)}, "
+          f"typed {sum(raw_typed.dtypes == object)}")
+
+    legacy_df, legacy_total = timed(legacy_path, data)
+    typed_df, typed_total = timed(typed_path, data)
+    print(f"{'read + clean':<16}{legacy_total:>12.3f}{typed_total:>12.3f}"
+          f"   speedup {legacy_total / typed_total:.1f}x")
+
+    columns = ['product_price_gbp', 'weight_kg', 'date_added']
+    parity = len(legacy_df) == len(typed_df) and all(
+        np.allclose(as_float(legacy_df[column]), as_float(typed_df[column]), equal_nan=True)
+        for column in columns
+    )
+    print(f"parity on {', '.join(columns)} and row count: {parity}")
+
+
+if __name__ == '__main__':
+    main()
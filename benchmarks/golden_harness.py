@@ -0,0 +1,353 @@
+# benchmarks/golden_harness.py
+"""
+Golden-output regression harness for DataCleaning.
+
+Every clean_* method is run on fixed synthetic inputs (or on anonymized samples
+placed in benchmarks/golden/inputs/<source>.parquet) and its output compared
+cell by cell against golden Parquet snapshots, with dtype-aware tolerance.
+
+Run from the repository root:
+    python -m benchmarks.golden_harness capture              # write the golden snapshots
+    python -m benchmarks.golden_harness capture pkg.mod:Cls  # ... from another implementation
+    python -m benchmarks.golden_harness check                # current code vs. goldens
+    python -m benchmarks.golden_harness compare pkg.mod:Cls  # candidate vs. current, timed
+
+Capture the goldens before an optimization, commit them, then `check` after it.
+Cases run with pandas copy-on-write on, as in main.py, unless
+`--copy-on-write off` is given. The committed goldens were captured from the
+original per-cell implementation (data_cleaning.py as of commit 86d8499, saved
+as a module outside the tree) with copy-on-write off:
+
+    git show 86d8499:data_cleaning.py > /tmp/ref/data_cleaning_baseline.py
+    PYTHONPATH=/tmp/ref python -m benchmarks.golden_harness capture \
+        data_cleaning_baseline:DataCleaning --copy-on-write off
+"""
+
+import argparse
+import copy
+import importlib
+import json
+import os
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import DataCleaning
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+INPUTS_DIR = os.path.join(GOLDEN_DIR, "inputs")
+ROWS = 2000
+SEED = 42
+
+
+def _pick(rng, values, rows):
+    values = np.array(values, dtype=object)
+    return values[rng.integers(0, len(values), rows)]
+
+
+def make_users(rows: int = ROWS, seed: int = SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'first_name': _pick(rng, ['Ana', 'Ben', 'NULL', 'GMRBOMI0O1'], rows),
+        'last_name': _pick(rng, ['Smith', 'Müller', 'Jones'], rows),
+        'date_of_birth': _pick(rng, ['1968-10-16', '1971/10/23', 'October 1968 16', '1944 May 02', 'NULL'], rows),
+        'address': _pick(rng, ['1 Road\nLondon\nE1 6AN', '5 Straße\nBerlin', 'N/A'], rows),
+        'country': _pick(rng, ['United Kingdom', 'Germany', 'United States', 'I7G4DMDZOZ', 'NULL'], rows),
+        'country_code': _pick(rng, ['GB', 'DE', 'US', 'GGB', 'QVUW9JSKY3', 'NULL'], rows),
+        'phone_number': _pick(rng, ['+44 (0)20 7946 0958', '(0161) 496 0143', '001-555-0100x123', 'NULL'], rows),
+        'join_date': _pick(rng, ['2016-10-16', '2017/11/04', '2011 January 23', 'NULL'], rows),
+        'user_uuid': [str(uuid.UUID(int=int(i))) for i in rng.integers(0, 2 ** 62, rows)],
+    })
+
+
+def make_cards(rows: int = ROWS, seed: int = SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'card_number': _pick(rng, ['??4971858637664481', '4252720361802860', 30483867001312, 'NULL'], rows),
+        'expiry_date': _pick(rng, ['09/26', '10/23', 'NULL'], rows),
+        'card_provider': _pick(rng, ['VISA 16 digit', 'Diners Club / Carte Blanche', 'NB71VBAHJE'], rows),
+        'date_payment_confirmed': _pick(rng, ['2015-11-25', '2001/03/19', 'December 2021 17', 'NULL'], rows),
+    })
+
+
+def make_stores(rows: int = ROWS, seed: int = SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'address': _pick(rng, ['Flat 72W\nSally isle\nEast Deantown', 'N/A', 'Heckenweg 6/5\n71976 Leibnitz'], rows),
+        'longitude': _pick(rng, ['-0.7', '13.3', 'N/A', None], rows),
+        'lat': _pick(rng, [None, '51.3', 'N/A'], rows),
+        'locality': _pick(rng, ['High Wycombe', 'Berlin', 'N/A', '9IBH8Y4Z0S'], rows),
+        'store_code': _pick(rng, ['HI-9B97EE4E', 'BE-F6E2F2D5', 'WEB-1388012W', 'NULL'], rows),
+        'staff_numbers': _pick(rng, ['34', 'J78', '3n9', 'NULL'], rows),
+        'opening_date': _pick(rng, ['2006-10-04', '2000/05/22', 'October 2012 08', 'NULL'], rows),
+        'store_type': _pick(rng, ['Local', 'Super Store', 'Web Portal', '5586JCLARW'], rows),
+        'latitude': _pick(rng, ['51.62907', '52.5', 'N/A', None], rows),
+        'country_code': _pick(rng, ['GB', 'DE', 'US', 'YELVM536YT'], rows),
+        'continent': _pick(rng, ['Europe', 'eeEurope', 'America', 'eeAmerica', 'QMAVR5H3LD'], rows),
+    })
+
+
+def make_products(rows: int = ROWS, seed: int = SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'product_name': _pick(rng, ['FurReal Dazzlin', 'Tea Set', 'NULL', 'VLPCU81M30'], rows),
+        'product_price': _pick(rng, ['£39.99', '£9.00', 'NULL'], rows),
+        'weight': _pick(rng, ['1.6kg', '12 x 100g', '590ml', '2 l', '77g .', '16oz', 'NULL'], rows),
+        'category': _pick(rng, ['toys-and-games', 'pets', 'NULL'], rows),
+        'EAN': _pick(rng, ['6104207617485', '2123549867439'], rows),
+        'date_added': _pick(rng, ['2005-12-02', '2018 October 22', 'September 2017 06', 'NULL'], rows),
+        'uuid': [str(uuid.UUID(int=int(i))) for i in rng.integers(0, 2 ** 62, rows)],
+        'removed': _pick(rng, ['Still_avaliable', 'Removed'], rows),
+        'product_code': _pick(rng, ['R7-3126933h', 'C2-7287916l'], rows),
+    })
+
+
+def make_orders(rows: int = ROWS, seed: int = SEED) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'level_0': np.arange(rows),
+        'index': np.arange(rows),
+        'date_uuid': [str(uuid.UUID(int=int(i))) for i in rng.integers(0, 2 ** 62, rows)],
+        'first_name': _pick(rng, [None, 'Ana'], rows),
+        'last_name': _pick(rng, [None, 'Smith'], rows),
+        'user_uuid': [str(uuid.UUID(int=int(i))) for i in rng.integers(0, 2 ** 62, rows)],
+        'card_number': _pick(rng, ['30060773296197', '4971858637664481'], rows),
+        'store_code': _pick(rng, ['BL-8387506C', 'WEB-1388012W'], rows),
+        'product_code': _pick(rng, ['R7-3126933h', 'C2-7287916l'], rows),
+        '1': _pick(rng, [None, np.nan], rows),
+        'product_quantity': _pick(rng, [3, '4', 'NULL'], rows),
+    })
+
+
+def make_date_events(rows: int = ROWS, seed: int = SEED) -> dict:
+    rng = np.random.default_rng(seed)
+    columns = {
+        'timestamp': _pick(rng, ['22:00:06', '05:30:01', 'NULL', 'F3AO8V2LHU'], rows),
+        'month': _pick(rng, ['9', '2', 'NULL'], rows),
+        'year': _pick(rng, ['2012', '1997', 'NULL'], rows),
+        'day': _pick(rng, ['19', '5', 'NULL'], rows),
+        'time_period': _pick(rng, ['Evening', 'Morning', 'NULL'], rows),
+        'date_uuid': [str(uuid.UUID(int=int(i))) for i in rng.integers(0, 2 ** 62, rows)],
+    }
+    return {name: {str(i): value for i, value in enumerate(values)} for name, values in columns.items()}
+
+
+SOURCES = {
+    'users': make_users,
+    'cards': make_cards,
+    'stores': make_stores,
+    'products': make_products,
+    'orders': make_orders,
+    'date_events': make_date_events,
+}
+
+# case name -> (DataCleaning method, input source, extra keyword arguments)
+CASES = {
+    'clean_user_data': ('clean_user_data', 'users', {}),
+    'clean_card_details': ('clean_card_details', 'cards', {}),
+    'clean_store_details': ('clean_store_details', 'stores', {}),
+    'clean_product_data': ('clean_product_data', 'products', {}),
+    'clean_orders_data': ('clean_orders_data', 'orders', {}),
+    'clean_date_events_data': ('clean_date_events_data', 'date_events', {}),
+    'clean_address': ('clean_address', 'users', {}),
+    'clean_country_columns': ('clean_country_columns', 'users', {}),
+    'clean_phone_number': ('clean_phone_number', 'users', {}),
+    'clean_dates': ('clean_dates', 'users', {'date_columns': ['date_of_birth', 'join_date']}),
+    'clean_card_number': ('clean_card_number', 'cards', {}),
+    'clean_categorical_columns': ('clean_categorical_columns', 'stores', {}),
+    'clean_locality': ('clean_locality', 'stores', {}),
+    'clean_store_code': ('clean_store_code', 'stores', {}),
+    'clean_staff_numbers': ('clean_staff_numbers', 'stores', {}),
+    'clean_weight_column': ('clean_weight_column', 'products', {}),
+}
+
+# case name -> columns the current implementation adds on purpose since the goldens
+# were captured; they are left out of `check`.
+ADDED_COLUMNS = {
+    'clean_date_events_data': ['month', 'year', 'day', 'time'],
+}
+
+
+def load_source(name: str):
+    """
+    Return the input for a source: an anonymized sample if one exists, else synthetic data.
+    """
+    sample_path = os.path.join(INPUTS_DIR, f"{name}.parquet")
+    if name != 'date_events' and os.path.exists(sample_path):
+        return pd.read_parquet(sample_path)
+    return SOURCES[name]()
+
+
+def run_case(cleaner, case: str, sources: dict, copy_on_write: bool = True) -> tuple:
+    """
+    Run one case on a private copy of its input, with pandas copy-on-write set as given.
+
+    Returns:
+        tuple: (output DataFrame, elapsed seconds)
+    """
+    method_name, source, kwargs = CASES[case]
+    data = copy.deepcopy(sources[source])
+    with pd.option_context('mode.copy_on_write', copy_on_write):
+        start = time.perf_counter()
+        result = getattr(cleaner, method_name)(data, **kwargs)
+        elapsed = time.perf_counter() - start
+    return result, elapsed
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Make a DataFrame storable as Parquet: object columns holding anything other
+    than strings (e.g. ints mixed with strings) are stored as their string form.
+    """
+    df = df.copy()
+    for column in df.columns:
+        series = df[column]
+        if series.dtype == object:
+            non_null = series.dropna()
+            if not non_null.map(lambda x: isinstance(x, str)).all():
+                df[column] = series.map(lambda x: x if pd.isna(x) else str(x))
+    df.columns = [str(column) for column in df.columns]
+    return df
+
+
+def _family(dtype) -> str:
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'bool'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    return 'text'
+
+
+def diff_frames(expected: pd.DataFrame, actual: pd.DataFrame, rtol: float = 1e-9,
+                max_cells: int = 10) -> list:
+    """
+    Compare two DataFrames cell by cell.
+
+    Numeric columns are compared with a relative tolerance, datetimes exactly, and
+    everything else by value; nulls of any kind compare equal to each other. Dtypes
+    only need to match by family (int vs. float, object vs. Arrow string are fine).
+
+    Returns:
+        list: Human-readable differences; empty if the frames match.
+    """
+    problems = []
+    if list(expected.columns) != list(actual.columns):
+        return [f"columns differ: expected {list(expected.columns)}, got {list(actual.columns)}"]
+    if not expected.index.equals(actual.index):
+        return [f"rows differ: expected {len(expected)} rows, got {len(actual)} "
+                f"({len(expected.index.symmetric_difference(actual.index))} index labels differ)"]
+
+    for column in expected.columns:
+        left, right = expected[column], actual[column]
+        if _family(left.dtype) != _family(right.dtype):
+            problems.append(f"{column}: dtype {left.dtype} vs {right.dtype}")
+            continue
+
+        both_null = left.isna().to_numpy() & right.isna().to_numpy()
+        if _family(left.dtype) == 'numeric':
+            a = left.to_numpy(dtype='float64', na_value=np.nan)
+            b = right.to_numpy(dtype='float64', na_value=np.nan)
+            equal = np.isclose(a, b, rtol=rtol, atol=0, equal_nan=True)
+        else:
+            equal = (left.astype(object) == right.astype(object)).fillna(False).to_numpy(dtype=bool)
+        mismatched = np.flatnonzero(~(equal | both_null))
+        for position in mismatched[:max_cells]:
+            problems.append(
+                f"{column}[{expected.index[position]}]: expected {left.iloc[position]!r}, "
+                f"got {right.iloc[position]!r}"
+            )
+        if len(mismatched) > max_cells:
+            problems.append(f"{column}: {len(mismatched) - max_cells} more mismatched cells")
+    return problems
+
+
+def capture(cleaner, copy_on_write: bool = True):
+    os.makedirs(GOLDEN_DIR, exist_ok=True)
+    sources = {name: load_source(name) for name in SOURCES}
+    timings = {}
+    for case in CASES:
+        result, elapsed = run_case(cleaner, case, sources, copy_on_write)
+        normalize(result).to_parquet(os.path.join(GOLDEN_DIR, f"{case}.parquet"))
+        timings[case] = elapsed
+        print(f"captured {case:<28}{len(result):>8} rows {elapsed:>9.3f}s")
+    with open(os.path.join(GOLDEN_DIR, "timings.json"), "w") as f:
+        json.dump(timings, f, indent=2)
+
+
+def check(cleaner, copy_on_write: bool = True) -> bool:
+    sources = {name: load_source(name) for name in SOURCES}
+    timings_path = os.path.join(GOLDEN_DIR, "timings.json")
+    golden_timings = {}
+    if os.path.exists(timings_path):
+        with open(timings_path) as f:
+            golden_timings = json.load(f)
+
+    ok = True
+    print(f"{'case':<28}{'golden (s)':>12}{'current (s)':>13}  result")
+    for case in CASES:
+        golden_path = os.path.join(GOLDEN_DIR, f"{case}.parquet")
+        if not os.path.exists(golden_path):
+            print(f"{case:<28}{'':>12}{'':>13}  no golden snapshot; run capture first")
+            ok = False
+            continue
+        result, elapsed = run_case(cleaner, case, sources, copy_on_write)
+        actual = normalize(result).drop(columns=ADDED_COLUMNS.get(case, []), errors='ignore')
+        problems = diff_frames(pd.read_parquet(golden_path), actual)
+        ok &= not problems
+        print(f"{case:<28}{golden_timings.get(case, float('nan')):>12.3f}{elapsed:>13.3f}  "
+              f"{'OK' if not problems else 'MISMATCH'}")
+        for problem in problems:
+            print(f"    {problem}")
+    return ok
+
+
+def compare(reference, candidate, copy_on_write: bool = True) -> bool:
+    sources = {name: load_source(name) for name in SOURCES}
+    ok = True
+    print(f"{'case':<28}{'current (s)':>13}{'candidate (s)':>15}{'speedup':>9}  result")
+    for case in CASES:
+        expected, reference_time = run_case(reference, case, sources, copy_on_write)
+        actual, candidate_time = run_case(candidate, case, sources, copy_on_write)
+        problems = diff_frames(normalize(expected), normalize(actual))
+        ok &= not problems
+        print(f"{case:<28}{reference_time:>13.3f}{candidate_time:>15.3f}"
+              f"{reference_time / candidate_time:>8.1f}x  {'OK' if not problems else 'MISMATCH'}")
+        for problem in problems:
+            print(f"    {problem}")
+    return ok
+
+
+def load_class(spec: str):
+    """
+    Instantiate a cleaner given as 'module:ClassName'.
+    """
+    module_name, class_name = spec.split(':')
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('mode', choices=['capture', 'check', 'compare'])
+    parser.add_argument('candidate', nargs='?',
+                        help="Class to capture from, or the candidate for compare, as 'module:ClassName'.")
+    parser.add_argument('--copy-on-write', choices=['on', 'off'], default='on',
+                        help="pandas copy-on-write mode for the runs (main.py runs with it on).")
+    args = parser.parse_args()
+    copy_on_write = args.copy_on_write == 'on'
+
+    if args.mode == 'capture':
+        capture(load_class(args.candidate) if args.candidate else DataCleaning(), copy_on_write)
+    elif args.mode == 'check':
+        raise SystemExit(0 if check(DataCleaning(), copy_on_write) else 1)
+    else:
+        if not args.candidate:
+            parser.error("compare needs a candidate 'module:ClassName'")
+        raise SystemExit(0 if compare(DataCleaning(), load_class(args.candidate), copy_on_write) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+# chunked_pipeline.py
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable
+
+import pandas as pd
+
+from database_connector import DatabaseConnector
+
+_DONE = object()
+
+
+class StageStats:
+    """
+    Row, chunk and busy-time counters for one pipeline stage.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = 0
+        self.chunks = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, rows: int, seconds: float):
+        with self._lock:
+            self.rows += rows
+            self.chunks += 1
+            self.busy_seconds += seconds
+
+    @property
+    def throughput(self) -> float:
+        """
+        Rows per second of busy time (summed across workers for the clean stage).
+        """
+        return self.rows / self.busy_seconds if self.busy_seconds else 0.0
+
+
+class ChunkedPipeline:
+    """
+    Streaming extract -> clean -> load pipeline over DataFrame chunks.
+
+    A reader thread pulls chunks from `chunks`, a pool of cleaner threads applies
+    `transform`, and the calling thread passes cleaned chunks to `sink`. The stages
+    are connected by bounded queues, so at most `queue_size` chunks wait between
+    any two stages and memory stays flat while all three stages overlap.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        transform: Callable[[pd.DataFrame], pd.DataFrame],
+        sink: Callable[[pd.DataFrame], None],
+        workers: int = 4,
+        queue_size: int = 4,
+        report_interval: float = 10.0
+    ):
+        """
+        Initialize the ChunkedPipeline.
+
+        Args:
+            chunks (Iterable[pd.DataFrame]): Source of raw chunks, consumed by the reader thread.
+            transform (Callable): Cleaning function applied to each chunk.
+            sink (Callable): Called with each cleaned chunk, in the calling thread.
+            workers (int, optional): Number of cleaner threads. Defaults to 4.
+            queue_size (int, optional): Capacity of each inter-stage queue. Defaults to 4.
+            report_interval (float, optional): Seconds between progress reports.
+                Defaults to 10.0; 0 disables them.
+        """
+        self.chunks = chunks
+        self.transform = transform
+        self.sink = sink
+        self.workers = workers
+        self.report_interval = report_interval
+        self.raw_queue = queue.Queue(maxsize=queue_size)
+        self.clean_queue = queue.Queue(maxsize=queue_size)
+        self.stats = {name: StageStats(name) for name in ("extract", "clean", "load")}
+        self._stop = threading.Event()
+        self._errors = []
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """
+        Put an item on a bounded queue, giving up if the pipeline is stopping.
+        """
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        """
+        Get an item from a queue, returning _DONE if the pipeline is stopping.
+        """
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _fail(self, stage: str, error: Exception):
+        print(f"Error in {stage} stage: {error}")
+        self._errors.append(error)
+        self._stop.set()
+
+    def _read(self):
+        try:
+            iterator = iter(self.chunks)
+            while True:
+                start = time.perf_counter()
+                chunk = next(iterator, None)
+                if chunk is None:
+                    break
+                self.stats["extract"].record(len(chunk), time.perf_counter() - start)
+                if not self._put(self.raw_queue, chunk):
+                    return
+        except Exception as e:
+            self._fail("extract", e)
+        finally:
+            for _ in range(self.workers):
+                self._put(self.raw_queue, _DONE)
+
+    def _clean(self):
+        try:
+            while True:
+                chunk = self._get(self.raw_queue)
+                if chunk is _DONE:
+                    break
+                start = time.perf_counter()
+                cleaned = self.transform(chunk)
+                self.stats["clean"].record(len(chunk), time.perf_counter() - start)
+                if not self._put(self.clean_queue, cleaned):
+                    return
+        except Exception as e:
+            self._fail("clean", e)
+        finally:
+            self._put(self.clean_queue, _DONE)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """
+        Return the current number of chunks waiting in each queue.
+
+        A full queue in front of a stage means that stage is the bottleneck.
+
+        Returns:
+            dict: Depths of the 'extract->clean' and 'clean->load' queues.
+        """
+        return {
+            "extract->clean": self.raw_queue.qsize(),
+            "clean->load": self.clean_queue.qsize(),
+        }
+
+    def report(self):
+        """
+        Print queue depths and per-stage throughput.
+        """
+        depths = ", ".join(f"{name}: {depth}" for name, depth in self.queue_depths().items())
+        print(f"Queue depths ({depths})")
+        for stats in self.stats.values():
+            print(
+                f"  {stats.name:<8} {stats.rows:>10} rows in {stats.chunks:>5} chunks, "
+                f"{stats.busy_seconds:8.2f}s busy, {stats.throughput:>10.0f} rows/s"
+            )
+
+    def run(self) -> bool:
+        """
+        Run the pipeline to completion.
+
+        Returns:
+            bool: True if every chunk was extracted, cleaned and loaded, otherwise False.
+        """
+        threads = [threading.Thread(target=self._read, daemon=True)]
+        threads += [threading.Thread(target=self._clean, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        started = last_report = time.perf_counter()
+        finished_workers = 0
+        try:
+            while finished_workers < self.workers:
+                chunk = self._get(self.clean_queue)
+                if chunk is _DONE:
+                    if self._stop.is_set():
+                        break
+                    finished_workers += 1
+                    continue
+                start = time.perf_counter()
+                self.sink(chunk)
+                self.stats["load"].record(len(chunk), time.perf_counter() - start)
+
+                if self.report_interval and time.perf_counter() - last_report >= self.report_interval:
+                    self.report()
+                    last_report = time.perf_counter()
+        except Exception as e:
+            self._fail("load", e)
+        finally:
+            for thread in threads:
+                thread.join()
+
+        print(f"Pipeline finished in {time.perf_counter() - started:.2f}s.")
+        self.report()
+        return not self._errors
+
+
+class CopySink:
+    """
+    Pipeline sink that COPYs cleaned chunks into a table, (re)creating the table
+    from the first chunk.
+    """
+
+    def __init__(self, db_connector: DatabaseConnector, table_name: str, schema: str = None):
+        """
+        Initialize the CopySink.
+
+        Args:
+            db_connector (DatabaseConnector): Connector for the destination database.
+            table_name (str): The destination table.
+            schema (str, optional): The destination schema. Defaults to None (search path).
+        """
+        self.db_connector = db_connector
+        self.table_name = table_name
+        self.schema = schema
+        self.dtypes = None
+        self.rows = 0
+
+    def __call__(self, df: pd.DataFrame):
+        if self.dtypes is None:
+            self.dtypes = df.dtypes
+            if_exists = 'replace'
+        else:
+            # A NaN in a later chunk turns an integer column to float; keep it integral.
+            for column, dtype in self.dtypes.items():
+                if pd.api.types.is_integer_dtype(dtype) and pd.api.types.is_float_dtype(df[column]):
+                    df[column] = df[column].astype('Int64')
+            if_exists = 'append'
+        self.rows += self.db_connector.copy_to_db(df, self.table_name, self.schema, if_exists)
@@ -0,0 +1,114 @@
+# crawl_checkpoint.py
+
+import json
+import os
+import time
+from typing import Any, Dict
+
+
+class CrawlCheckpoint:
+    """
+    Append-only JSON Lines checkpoint of fetched records, so an interrupted
+    crawl can resume from the records it has not fetched yet.
+
+    The first line is a header with the time the crawl started and a
+    description of the run (e.g. the number of stores). A checkpoint from a
+    different run, or one older than `max_age` seconds, is discarded on load,
+    so records that failed for good cannot keep stale payloads alive.
+    """
+
+    def __init__(self, path: str, run: Dict[str, Any] = None, max_age: float = None):
+        """
+        Initialize the CrawlCheckpoint.
+
+        Args:
+            path (str): Path to the JSON Lines checkpoint file.
+            run (dict, optional): Identifies the crawl; a checkpoint written for a
+                different run is discarded. Defaults to None (any run).
+            max_age (float, optional): Seconds after the crawl started beyond which
+                the checkpoint is discarded. Defaults to None (no limit).
+        """
+        self.path = path
+        self.run = run or {}
+        self.max_age = max_age
+        self._file = None
+
+    def load(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Read the records checkpointed so far.
+
+        A truncated last line (from a killed process) is ignored. A checkpoint
+        without a header, from another run or past its maximum age is deleted.
+
+        Returns:
+            dict: A mapping of record key to payload, empty if there is no usable checkpoint.
+        """
+        records = {}
+        if not os.path.exists(self.path):
+            return records
+
+        header = None
+        with open(self.path, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    if header is None:
+                        header = {"started": float(entry["started"]), "run": entry["run"]}
+                        continue
+                    records[int(entry["key"])] = entry["payload"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+        stale = self._stale_reason(header)
+        if stale:
+            print(f"Discarding crawl checkpoint {self.path}: {stale}.")
+            self.clear()
+            return {}
+        return records
+
+    def _stale_reason(self, header) -> str:
+        if header is None:
+            return "no header"
+        if header["run"] != self.run:
+            return f"written for run {header['run']}, not {self.run}"
+        age = time.time() - header["started"]
+        if self.max_age is not None and age > self.max_age:
+            return f"{age / 3600:.1f} hours old"
+        return ""
+
+    def append(self, key: int, payload: Dict[str, Any]):
+        """
+        Append one fetched record and flush it to disk, starting the file with
+        its header if it is new.
+
+        Args:
+            key (int): The record key, e.g. the store number.
+            payload (dict): The fetched payload.
+        """
+        if self._file is None:
+            self._file = open(self.path, "a+")
+            if self._file.tell() == 0:
+                self._file.write(json.dumps({"started": time.time(), "run": self.run}) + "\n")
+            else:
+                # Terminate a truncated last line so it does not swallow this record.
+                self._file.seek(self._file.tell() - 1)
+                if self._file.read(1) != "\n":
+                    self._file.write("\n")
+        self._file.write(json.dumps({"key": key, "payload": payload}) + "\n")
+        self._file.flush()
+
+    def close(self):
+        """
+        Close the checkpoint file if it is open.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def clear(self):
+        """
+        Close and delete the checkpoint once the crawl has completed.
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -7,10 +7,38 @@ import json
 import requests
 from typing import List, Dict, Any
 
+# Patterns are compiled once at import time and reused by the vectorized
+# `.str` accessors below instead of being re-parsed per cell.
+NON_DIGIT_PATTERN = re.compile(r'\D')
+QUESTION_MARK_PATTERN = re.compile(r'\?')
+COMMA_SPACING_PATTERN = re.compile(r',\s*')
+WEIGHT_PATTERN = re.compile(r'(\d+\.?\d*)(.*)', re.DOTALL)
+DATE_FORMATS = [
+    (re.compile(r'^\d{4}-\d{2}-\d{2}$'), '%Y-%m-%d'),
+    (re.compile(r'^\d{4}/\d{2}/\d{2}$'), '%Y/%m/%d'),
+    (re.compile(r'^\d{2}/\d{2}/\d{4}$'), '%d/%m/%Y'),
+    (re.compile(r'^\d{2}/\d{2}$'), '%m/%y'),
+    (re.compile(r'^\w+ \d{4} \d{2}$'), '%B %Y %d'),
+    (re.compile(r'^\d{4} \w+ \d{2}$'), '%Y %B %d'),
+]
+# pandas' general parser reads these month-first, and it has always taken
+# precedence over them, so they are only tried on what it cannot parse.
+FALLBACK_DATE_FORMATS = {'%d/%m/%Y', '%m/%y'}
+
 
 class DataCleaning:
     """
     Collection of data cleaning methods for DataFrames.
+
+    Every method takes ownership of the DataFrame it is given and returns the
+    result, which may share memory with the input. Callers must continue with
+    the returned frame and not reuse the one they passed in.
+
+    The methods are written for pandas copy-on-write mode, which main.py enables:
+    filtered frames and the results of drop/rename then share data with their
+    parent until written to, so no step copies a whole frame just to hand it to
+    the next one. They give the same results, without SettingWithCopyWarning,
+    with copy-on-write off.
     """
 
     def __init__(self):
@@ -87,10 +115,13 @@ class DataCleaning:
         df = self.standardize_nulls(df)
         df = self.remove_invalid_rows(df)
         df = self.clean_weight_column(df)
-        df['product_price'] = df['product_price'].str.replace('£', '')
-        df = self.convert_data_types(df, ['product_price'])
-        df.rename(columns={'product_price': 'product_price_gbp'}, inplace=True)
-        df = self.clean_dates(df, date_columns=['date_added'])
+        # Prices and dates may already be typed by DataExtractor.parse_products_csv.
+        if not pd.api.types.is_numeric_dtype(df['product_price']):
+            df['product_price'] = df['product_price'].str.replace('£', '')
+            df = self.convert_data_types(df, ['product_price'])
+        df = df.rename(columns={'product_price': 'product_price_gbp'})
+        if not pd.api.types.is_datetime64_any_dtype(df['date_added']):
+            df = self.clean_dates(df, date_columns=['date_added'])
         return df
 
     def clean_orders_data(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -136,9 +167,15 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The transformed DataFrame.
         """
-        null_representations = ['NULL', 'None', 'N/A', '']
-        df.replace(null_representations, np.nan, inplace=True)
-        df = df.where(pd.notnull(df), np.nan)
+        null_representations = ['NULL', 'None', 'N/A', '', None]
+        # Replaced column by column, so each column gets its own array. A frame-wide
+        # replace returns one 2-D block that the columns later steps keep would
+        # only view, holding every replaced or dropped column alive with them.
+        # Columns left all null are downcast to float as before, explicitly rather
+        # than through replace's deprecated silent downcasting.
+        with pd.option_context('future.no_silent_downcasting', True):
+            for col in df.select_dtypes(include=['object', 'string']).columns:
+                df[col] = df[col].replace(null_representations, np.nan).infer_objects(copy=False)
         return df
 
     def clean_address(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -164,12 +201,8 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The transformed DataFrame.
         """
-        df['country'] = df['country'].apply(
-            lambda x: x if not any(char.isdigit() for char in str(x)) else np.nan
-        )
-        df['country_code'] = df['country_code'].apply(
-            lambda x: x if (not any(char.isdigit() for char in str(x)) and len(str(x)) <= 3) else np.nan
-        )
+        df['country'] = self.validate_no_digits(df['country'])
+        df['country_code'] = self.validate_no_digits(df['country_code'], max_length=3)
         df['country_code'] = df['country_code'].replace('GGB', 'GB')
         return df
 
@@ -183,13 +216,15 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The transformed DataFrame.
         """
-        df['phone_number'] = df['phone_number'].apply(lambda x: re.sub(r'\D', '', str(x)))
+        df['phone_number'] = self.replace_in_strings(df['phone_number'].astype(str), NON_DIGIT_PATTERN, '')
         return df
 
     def clean_dates(self, df: pd.DataFrame, date_columns: List[str]) -> pd.DataFrame:
         """
         Convert specified columns to datetime, handling non-standard formats.
 
+        Each distinct value is parsed once, see parse_dates.
+
         Args:
             df (pd.DataFrame): The DataFrame to transform.
             date_columns (List[str]): List of columns to convert to datetime.
@@ -198,40 +233,57 @@ class DataCleaning:
             pd.DataFrame: The transformed DataFrame.
         """
         for col in date_columns:
-            df[col] = df[col].apply(
-                lambda x: self.parse_non_standard_dates(x)
-                if pd.isna(pd.to_datetime(x, errors='coerce'))
-                else pd.to_datetime(x, errors='coerce')
-            )
+            df[col] = self.parse_unique(df[col], self.parse_dates)
         return df
 
-    def parse_non_standard_dates(self, date_str: str) -> pd.Timestamp:
+    def parse_dates(self, dates: pd.Series) -> pd.Series:
         """
-        Attempt to parse non-standard date strings into pd.Timestamp.
+        Parse a Series of dates written in any of the formats seen in the sources.
+
+        Strings matching one of DATE_FORMATS are parsed with one pd.to_datetime
+        call per format; pandas' general parser handles the rest, and is tried
+        before FALLBACK_DATE_FORMATS.
 
         Args:
-            date_str (str): The date string to parse.
+            dates (pd.Series): The values to parse.
 
         Returns:
-            pd.Timestamp or np.nan: A parsed Timestamp or NaN if it fails.
+            pd.Series: The parsed datetimes, NaT where a value cannot be parsed.
         """
-        try:
-            if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-                return pd.to_datetime(date_str, format='%Y-%m-%d')
-            elif re.match(r'^\d{4}/\d{2}/\d{2}$', date_str):
-                return pd.to_datetime(date_str, format='%Y/%m/%d')
-            elif re.match(r'^\d{2}/\d{2}/\d{4}$', date_str):
-                return pd.to_datetime(date_str, format='%d/%m/%Y')
-            elif re.match(r'^\d{2}/\d{2}$', date_str):
-                return pd.to_datetime(date_str, format='%m/%y')
-            elif re.match(r'^\w+ \d{4} \d{2}$', date_str):
-                return pd.to_datetime(date_str, format='%B %Y %d')
-            elif re.match(r'^\d{4} \w+ \d{2}$', date_str):
-                return pd.to_datetime(date_str, format='%Y %B %d')
-            else:
-                return pd.to_datetime(date_str, errors='coerce')
-        except Exception:
-            return np.nan
+        if not (pd.api.types.is_object_dtype(dates) or pd.api.types.is_string_dtype(dates)):
+            return pd.to_datetime(dates, errors='coerce')
+        preferred = [(p, f) for p, f in DATE_FORMATS if f not in FALLBACK_DATE_FORMATS]
+        fallback = [(p, f) for p, f in DATE_FORMATS if f in FALLBACK_DATE_FORMATS]
+
+        parsed = self.parse_non_standard_dates(dates, preferred)
+        unparsed = parsed.isna()
+        if unparsed.any():
+            parsed[unparsed] = pd.to_datetime(dates[unparsed], format='mixed', errors='coerce')
+        unparsed = parsed.isna()
+        if unparsed.any():
+            parsed[unparsed] = self.parse_non_standard_dates(dates[unparsed], fallback)
+        return parsed
+
+    def parse_non_standard_dates(self, dates: pd.Series, date_formats=DATE_FORMATS) -> pd.Series:
+        """
+        Parse date strings with the first of the given formats whose pattern they match.
+
+        Args:
+            dates (pd.Series): The date strings to parse.
+            date_formats (list, optional): (compiled pattern, format) pairs. Defaults to DATE_FORMATS.
+
+        Returns:
+            pd.Series: The parsed datetimes, NaT where no pattern matches or the format does not fit.
+        """
+        parsed = pd.Series(pd.NaT, index=dates.index, dtype='datetime64[ns]')
+        remaining = dates
+        for pattern, date_format in date_formats:
+            matches = remaining.str.match(pattern, na=False).to_numpy(dtype=bool)
+            if matches.any():
+                matched = remaining[matches]
+                parsed[matched.index] = pd.to_datetime(matched, format=date_format, errors='coerce')
+                remaining = remaining[~matches]
+        return parsed
 
     def clean_card_number(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -243,9 +295,44 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The transformed DataFrame.
         """
-        df['card_number'] = df['card_number'].apply(
-            lambda x: re.sub(r'\?', '', str(x)) if isinstance(x, str) else x
-        )
+        df['card_number'] = self.replace_in_strings(df['card_number'], QUESTION_MARK_PATTERN, '')
+        return df
+
+    def replace_in_strings(self, series: pd.Series, pattern: re.Pattern, repl: str) -> pd.Series:
+        """
+        Apply a regex substitution to the string values of a Series, leaving
+        non-string values (numbers, NaN, timestamps) untouched.
+
+        The substitution is applied to the values directly: `.str.replace` runs
+        the same per-value substitution but also nulls the non-strings, which
+        then have to be put back, and ends up slower than a plain apply.
+
+        Args:
+            series (pd.Series): The Series to transform.
+            pattern (re.Pattern): The precompiled pattern to substitute.
+            repl (str): The replacement string.
+
+        Returns:
+            pd.Series: The transformed Series.
+        """
+        if not (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)):
+            return series
+        substitute = pattern.sub
+        replaced = [substitute(repl, x) if isinstance(x, str) else x for x in series.to_numpy()]
+        return pd.Series(replaced, index=series.index, name=series.name, dtype=series.dtype)
+
+    def normalize_comma_spacing(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normalize the spacing after commas to a single space in all string columns.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to transform.
+
+        Returns:
+            pd.DataFrame: The transformed DataFrame.
+        """
+        for col in df.select_dtypes(include=['object', 'string']).columns:
+            df[col] = self.replace_in_strings(df[col], COMMA_SPACING_PATTERN, ', ')
         return df
 
     def remove_invalid_rows(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -259,14 +346,7 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The filtered DataFrame.
         """
-        def is_invalid_pattern(val):
-            if isinstance(val, str) and len(val) == 10 and val.isalnum() and not val.isdigit() and not val.isalpha():
-                return True
-            return False
-
-        invalid_rows = df.apply(lambda row: any(is_invalid_pattern(val) for val in row), axis=1)
-        df = df[~invalid_rows]
-        return df
+        return self.keep_rows(df, ~self.invalid_pattern_mask(df))
 
     def remove_invalid_rows_date_events_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -279,14 +359,35 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The filtered DataFrame.
         """
-        def is_invalid_pattern(val):
-            if isinstance(val, str) and len(val) == 10 and val.isalnum() and not val.isdigit() and not val.isalpha():
-                return True
-            return False
+        return self.keep_rows(df, ~self.invalid_pattern_mask(df))
 
-        invalid_rows = df.apply(lambda row: any(is_invalid_pattern(val) for val in row), axis=1)
-        df = df[~invalid_rows]
-        return df
+    def invalid_pattern_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Flag rows where any string cell is a 10-character alphanumeric value that
+        is neither all digits nor all letters, checked column by column.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to check.
+
+        Returns:
+            np.ndarray: A boolean array, True for invalid rows.
+        """
+        invalid = np.zeros(len(df), dtype=bool)
+        for col in df.columns:
+            if not (pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col])):
+                continue
+            try:
+                values = df[col].str
+            except AttributeError:
+                # Object column without any strings, e.g. all NaN or all numbers.
+                continue
+            invalid |= (
+                values.len().eq(10)
+                & values.isalnum().eq(True)
+                & values.isdigit().eq(False)
+                & values.isalpha().eq(False)
+            ).fillna(False).to_numpy(dtype=bool)
+        return invalid
 
     def merge_latitude_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -299,7 +400,7 @@ class DataCleaning:
             pd.DataFrame: The transformed DataFrame.
         """
         df['latitude'] = df['latitude'].combine_first(df['lat'])
-        df.drop(columns=['lat'], inplace=True)
+        df = df.drop(columns=['lat'])
         return df
 
     def convert_data_types(self, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
@@ -327,18 +428,12 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The transformed DataFrame.
         """
-        df['store_type'] = df['store_type'].apply(
-            lambda x: x if not any(char.isdigit() for char in str(x)) else np.nan
-        )
-        df['country_code'] = df['country_code'].apply(
-            lambda x: x if (not any(char.isdigit() for char in str(x)) and len(str(x)) <= 3) else np.nan
-        )
+        df['store_type'] = self.validate_no_digits(df['store_type'])
+        df['country_code'] = self.validate_no_digits(df['country_code'], max_length=3)
         df['continent'] = df['continent'].apply(
             lambda x: x.replace('ee', '') if isinstance(x, str) else x
         )
-        df['continent'] = df['continent'].apply(
-            lambda x: x if not any(char.isdigit() for char in str(x)) else np.nan
-        )
+        df['continent'] = self.validate_no_digits(df['continent'])
         return df
 
     def clean_locality(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -351,11 +446,44 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The transformed DataFrame.
         """
-        df['locality'] = df['locality'].apply(
-            lambda x: x if (isinstance(x, str) and not any(char.isdigit() for char in x)) else np.nan
-        )
+        df['locality'] = self.validate_no_digits(df['locality'], strings_only=True)
         return df
 
+    def validate_no_digits(
+        self,
+        series: pd.Series,
+        max_length: int = None,
+        strings_only: bool = False
+    ) -> pd.Series:
+        """
+        Replace values containing digits (or longer than `max_length`) with NaN.
+
+        Values are checked as their string representation, once per unique value,
+        and the result is mapped back to every row. These columns have very few
+        distinct values, so the check is cheap regardless of the row count.
+
+        Args:
+            series (pd.Series): The Series to validate.
+            max_length (int, optional): Maximum allowed string length. Defaults to None.
+            strings_only (bool, optional): Treat non-string values as invalid. Defaults to False.
+
+        Returns:
+            pd.Series: The Series with invalid values replaced by NaN.
+        """
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        uniques = pd.Series(np.asarray(uniques, dtype=object))
+        as_str = uniques.astype(str)
+
+        valid = ~as_str.str.contains(r'\d', regex=True)
+        if max_length is not None:
+            valid &= as_str.str.len() <= max_length
+        if strings_only:
+            valid &= uniques.map(lambda x: isinstance(x, str))
+
+        # Nulls (code -1) are kept as NaN either way.
+        keep = np.append(valid.to_numpy(dtype=bool), False)[codes]
+        return series.where(keep)
+
     def clean_store_code(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         This function does not alter 'store_code' by default.
@@ -378,10 +506,9 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The transformed DataFrame.
         """
-        df['staff_numbers'] = df['staff_numbers'].apply(
-            lambda x: re.sub(r'[^\d]', '', str(x)) if pd.notnull(x) else x
-        )
-        df['staff_numbers'] = df['staff_numbers'].replace('', np.nan)
+        staff_numbers = df['staff_numbers']
+        digits = staff_numbers.astype(str).str.replace(NON_DIGIT_PATTERN, '', regex=True)
+        df['staff_numbers'] = digits.where(staff_numbers.notna()).replace('', np.nan)
         return df
 
     def clean_weight_column(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -394,52 +521,65 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The transformed DataFrame with a new 'weight_kg' column.
         """
-        def extract_number_unit(s):
-            if pd.isna(s):
-                return [None, None]
-            parts = re.split(r'(\d+\.?\d*)', s.replace(' ', ''))
-            if len(parts) < 3:
-                return [None, None]
-            number = parts[1]
-            unit = ''.join(parts[2:]).lower().strip()
-            return [number, unit]
-
-        def normalize_units(unit):
-            if not unit:
-                return None
-            unit = unit.lower().strip()
-            if 'kg' in unit or 'kilogram' in unit:
-                return 'kg'
-            elif 'g' in unit or 'gram' in unit:
-                return 'g'
-            elif 'ml' in unit or 'milliliter' in unit or 'millilitre' in unit:
-                return 'g'
-            elif 'liter' in unit or 'liters' in unit or 'litre' in unit or 'litres' in unit:
-                return 'liters'
-            else:
-                return None
-
-        def convert_to_kilograms(row):
-            try:
-                number = float(row['number'])
-                unit = row['unit']
-                if unit == 'g':
-                    return number / 1000
-                elif unit == 'kg':
-                    return number
-                elif unit == 'liters':
-                    return number
-                else:
-                    return None
-            except (TypeError, ValueError):
-                return None
-
-        df[['number', 'unit']] = df['weight'].apply(extract_number_unit).apply(pd.Series)
-        df['unit'] = df['unit'].apply(normalize_units)
-        df['weight_kg'] = df.apply(convert_to_kilograms, axis=1)
-        df.drop(['weight', 'number', 'unit'], axis=1, inplace=True)
+        # The first number is the quantity; everything after it is the unit.
+        parts = df['weight'].str.replace(' ', '', regex=False).str.extract(WEIGHT_PATTERN)
+        number = pd.to_numeric(parts[0], errors='coerce')
+        unit = parts[1].str.lower().str.strip()
+
+        # Grams and millilitres are divided by 1000; kilograms and litres are kept.
+        divisor = np.select(
+            [
+                unit.str.contains('kg|kilogram', na=False).to_numpy(dtype=bool),
+                unit.str.contains('g', na=False).to_numpy(dtype=bool),
+                unit.str.contains('ml|milliliter|millilitre', na=False).to_numpy(dtype=bool),
+                unit.str.contains('liter|litre', na=False).to_numpy(dtype=bool),
+            ],
+            [1.0, 1000.0, 1000.0, 1.0],
+            default=np.nan,
+        )
+        df['weight_kg'] = number / divisor
+        df = df.drop(columns=['weight'])
         return df
 
+    def deduplicate(self, df: pd.DataFrame, key_column: str, order_by: str = None) -> pd.DataFrame:
+        """
+        Drop rows with a null key and keep one row per key, so a primary key on
+        `key_column` can be added after loading.
+
+        Keys are compared by their string form (so 1234 and '1234' count as the
+        same VARCHAR key). Rows with a unique key are kept in one pass; only the
+        duplicated rows are sorted to pick a winner.
+
+        Args:
+            df (pd.DataFrame): The cleaned DataFrame.
+            key_column (str): The primary key column.
+            order_by (str, optional): Keep the row with the latest value in this column.
+                Defaults to None (keep the last row for each key).
+
+        Returns:
+            pd.DataFrame: The deduplicated DataFrame, in the original row order.
+        """
+        not_null = df[key_column].notna().to_numpy()
+        keys = df[key_column].astype(str)
+
+        duplicated = keys.duplicated(keep=False).to_numpy() & not_null
+        keep = not_null & ~duplicated
+
+        if duplicated.any():
+            positions = np.flatnonzero(duplicated)
+            candidates = pd.DataFrame({'key': keys.to_numpy()[positions], 'position': positions})
+            if order_by is not None:
+                candidates['order'] = df[order_by].to_numpy()[positions]
+                candidates = candidates.sort_values('order', na_position='first', kind='stable')
+            winners = candidates.drop_duplicates('key', keep='last')['position'].to_numpy()
+            keep[winners] = True
+
+        print(
+            f"Deduplicated on {key_column}: dropped {int((~not_null).sum())} null keys "
+            f"and {int(duplicated.sum() - (keep & duplicated).sum())} duplicates."
+        )
+        return self.keep_rows(df, keep)
+
     def drop_columns(self, df: pd.DataFrame, columns_to_drop: List[str]) -> pd.DataFrame:
         """
         Drop the specified columns from the DataFrame.
@@ -504,33 +644,82 @@ class DataCleaning:
         Returns:
             pd.DataFrame: The filtered DataFrame.
         """
-        df.replace('NULL', pd.NA, inplace=True)
-        df.dropna(subset=['timestamp', 'day', 'month', 'year'], inplace=True)
+        df = df.replace('NULL', pd.NA)
+        df = df.dropna(subset=['timestamp', 'day', 'month', 'year'])
         return df
 
     def combine_datetime_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Combine 'year', 'month', 'day', and 'timestamp' into a single 'datetime' column,
-        then drop the original columns.
+        Build a 'datetime' column from 'year', 'month', 'day' and 'timestamp'.
+
+        The date is assembled from the numeric components and the time of day is
+        added as a timedelta, so no per-row strings are built. Typed 'year',
+        'month' and 'day' columns and an 'HH:MM:SS' 'time' column are taken from
+        the result, so they load directly without a post-load UPDATE.
 
         Args:
             df (pd.DataFrame): The DataFrame containing the date/time columns.
 
         Returns:
-            pd.DataFrame: The DataFrame with the new 'datetime' column.
-        """
-        df['datetime'] = pd.to_datetime(
-            df['year'].astype(str)
-            + '-'
-            + df['month'].astype(str)
-            + '-'
-            + df['day'].astype(str)
-            + ' '
-            + df['timestamp']
+            pd.DataFrame: The DataFrame with 'datetime', 'year', 'month', 'day' and 'time' columns.
+        """
+        # The components and times repeat a few values, so each is parsed once.
+        components = pd.DataFrame({
+            col: self.parse_unique(df[col], lambda x: pd.to_numeric(x, errors='coerce'))
+            for col in ['year', 'month', 'day']
+        })
+        time_of_day = self.parse_unique(df['timestamp'], lambda x: pd.to_timedelta(x, errors='coerce'))
+        # Values of a day or more are not times of day.
+        time_of_day = time_of_day.where(time_of_day < pd.Timedelta(days=1))
+        df['datetime'] = pd.to_datetime(components, errors='coerce') + time_of_day
+        # Components that do not form a valid datetime are nulled with it.
+        df['year'] = df['datetime'].dt.year.astype('Int16')
+        df['month'] = df['datetime'].dt.month.astype('Int8')
+        df['day'] = df['datetime'].dt.day.astype('Int8')
+        # Formatted once per distinct time of day, as TO_CHAR(..., 'HH24:MI:SS') gave.
+        df['time'] = self.parse_unique(
+            time_of_day.where(df['datetime'].notna()),
+            lambda t: (pd.Timestamp(0) + pd.to_timedelta(t)).dt.strftime('%H:%M:%S'),
         )
-        df.drop(['timestamp', 'day', 'month', 'year'], axis=1, inplace=True)
+        df = df.drop(columns=['timestamp'])
         return df
 
+    def keep_rows(self, df: pd.DataFrame, mask) -> pd.DataFrame:
+        """
+        Return the rows of a DataFrame where `mask` is True.
+
+        The rows are taken by position rather than with df[mask], which with
+        copy-on-write off marks the result as a slice of `df`, so later column
+        assignments on it raise SettingWithCopyWarning.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to filter.
+            mask (array-like of bool): Which rows to keep.
+
+        Returns:
+            pd.DataFrame: The kept rows.
+        """
+        return df.take(np.flatnonzero(np.asarray(mask, dtype=bool)))
+
+    def parse_unique(self, series: pd.Series, parser) -> pd.Series:
+        """
+        Apply a vectorized parser to the distinct values of a Series only, and
+        broadcast the results back. Date component and time columns repeat a
+        handful of values, so this parses far fewer strings than the column holds.
+
+        Args:
+            series (pd.Series): The values to parse.
+            parser (Callable): Parses a Series of values, e.g. pd.to_numeric.
+
+        Returns:
+            pd.Series: The parsed values, NaN/NaT where the input is null.
+        """
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        parsed = parser(pd.Series(np.asarray(uniques, dtype=object)))
+        # Nulls (code -1) pick up the appended null.
+        parsed = pd.concat([parsed, parser(pd.Series([None], dtype=object))], ignore_index=True)
+        return pd.Series(parsed.to_numpy()[codes], index=series.index, name=series.name, copy=False)
+
     def remove_invalid_rows_excluding_store_code(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Remove rows with NaN in 'store_code', except preserve a specific store_code.
@@ -542,5 +731,5 @@ class DataCleaning:
             pd.DataFrame: The filtered DataFrame.
         """
         preserved_row_condition = df['store_code'] == 'WEB-1388012W'
-        df = df[~df['store_code'].isna() | preserved_row_condition]
+        df = self.keep_rows(df, ~df['store_code'].isna() | preserved_row_condition)
         return df
\ No newline at end of file
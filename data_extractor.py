@@ -1,15 +1,24 @@
 # class_1_data_extractor.py
 
 import configparser
+import re
 import yaml
 import pandas as pd
 import requests
-import tabula
-import boto3
 from sqlalchemy import text
-from io import StringIO
+from io import BytesIO, StringIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional
 
+from crawl_checkpoint import CrawlCheckpoint
+from data_cleaning import DataCleaning
 from database_connector import DatabaseConnector
+from table_cache import TableCache
+
+PRODUCT_COLUMNS = [
+    "product_name", "product_price", "weight", "category", "EAN",
+    "date_added", "uuid", "removed", "product_code",
+]
 
 
 class DataExtractor:
@@ -22,7 +31,8 @@ class DataExtractor:
         self,
         db_connector: DatabaseConnector = None,
         config_path_ini: str = "config.ini",
-        config_path_yaml: str = "api_conn.yaml"
+        config_path_yaml: str = "api_conn.yaml",
+        cache: TableCache = None
     ):
         """
         Initialize the DataExtractor instance.
@@ -36,8 +46,11 @@ class DataExtractor:
                 Defaults to "config.ini".
             config_path_yaml (str, optional):
                 Path to the YAML file containing the API key. Defaults to "api_conn.yaml".
+            cache (TableCache, optional):
+                Local cache for read_rds_table results. Defaults to None (no caching).
         """
         self.db_connector = db_connector
+        self.cache = cache
 
         # Load config.ini
         self.config = configparser.ConfigParser()
@@ -54,6 +67,7 @@ class DataExtractor:
         self.store_details_endpoint = self.config["API"].get("store_details_endpoint", "")
         self.pdf_link = self.config["API"].get("pdf_link", "")
         self.s3_uri = self.config["API"].get("s3_uri", "")
+        self.checkpoint_max_age = self.config["API"].getfloat("checkpoint_max_age_hours", 24) * 3600
 
     def list_tables(self) -> list:
         """
@@ -92,12 +106,13 @@ class DataExtractor:
             print("No database connection provided.")
             return []
 
-    def read_rds_table(self, table_name: str) -> pd.DataFrame:
+    def read_rds_table(self, table_name: str, limit: int = None) -> pd.DataFrame:
         """
         Read a table from the RDS database into a pandas DataFrame.
 
         Args:
             table_name (str): Name of the table to read.
+            limit (int, optional): Maximum number of rows to read. Defaults to None (all rows).
 
         Returns:
             pd.DataFrame: A DataFrame of the table data,
@@ -105,8 +120,20 @@ class DataExtractor:
         """
         if self.db_connector:
             try:
+                cache_key, fingerprint = None, None
+                if self.cache and limit is None:
+                    cache_key, fingerprint = self.table_cache_identity(table_name)
+                    cached_df = self.cache.get(cache_key, fingerprint)
+                    if cached_df is not None:
+                        return cached_df
+
                 query = f"SELECT * FROM {table_name}"
+                if limit is not None:
+                    query += f" LIMIT {int(limit)}"
                 df = pd.read_sql(query, self.db_connector.engine)
+
+                if fingerprint is not None:
+                    self.cache.put(cache_key, fingerprint, df)
                 return df
             except Exception as e:
                 print(f"Error reading table {table_name}: {e}")
@@ -115,10 +142,129 @@ class DataExtractor:
             print("No database connection provided.")
             return pd.DataFrame()
 
-    def retrieve_pdf_data(self) -> pd.DataFrame:
+    def sample_rds_table(self, table_name: str, percent: float = 1.0, limit: int = 1000) -> pd.DataFrame:
+        """
+        Read a random sample of a table with TABLESAMPLE SYSTEM, which reads only
+        the sampled pages instead of scanning the table. Tables too small to
+        yield any sampled rows are read from the start instead.
+
+        Args:
+            table_name (str): Name of the table to sample.
+            percent (float, optional): Percentage of the table's pages to sample. Defaults to 1.0.
+            limit (int, optional): Maximum number of rows to return. Defaults to 1000.
+
+        Returns:
+            pd.DataFrame: The sampled rows,
+                          or an empty DataFrame if an error occurs or the connection is missing.
+        """
+        if not self.db_connector:
+            print("No database connection provided.")
+            return pd.DataFrame()
+
+        try:
+            query = f"SELECT * FROM {table_name} TABLESAMPLE SYSTEM ({float(percent)}) LIMIT {int(limit)}"
+            df = pd.read_sql(query, self.db_connector.engine)
+            if df.empty:
+                df = pd.read_sql(f"SELECT * FROM {table_name} LIMIT {int(limit)}", self.db_connector.engine)
+            return df
+        except Exception as e:
+            print(f"Error sampling table {table_name}: {e}")
+            return pd.DataFrame()
+
+    def table_cache_identity(self, table_name: str) -> tuple:
+        """
+        Identify a table for the table cache.
+
+        The cache key names the connection (host, port, database) and the schema the
+        table resolves to, so the same table name read from two regional databases
+        gets two cache entries. The fingerprint is a cheap summary of the table's
+        contents from the Postgres statistics collector: insert/update/delete
+        counters, live tuples and relation size. Any write to the table changes it;
+        a statistics reset only causes a cache miss.
+
+        Args:
+            table_name (str): Name of the table.
+
+        Returns:
+            tuple: (cache key, fingerprint), or (None, None) if they could not be computed.
+        """
+        query = text(
+            "SELECT schemaname, n_tup_ins, n_tup_upd, n_tup_del, n_live_tup, pg_relation_size(relid) "
+            "FROM pg_stat_user_tables WHERE relid = to_regclass(:table_name)"
+        )
+        try:
+            with self.db_connector.engine.connect() as connection:
+                row = connection.execute(query, {"table_name": table_name}).fetchone()
+        except Exception as e:
+            print(f"Error fingerprinting table {table_name}: {e}")
+            return None, None
+        if row is None:
+            return None, None
+
+        url = self.db_connector.engine.url
+        source = f"{url.host}_{url.port}_{url.database}_{row[0]}.{table_name}"
+        cache_key = re.sub(r"[^\w.-]", "_", source)
+        return cache_key, ":".join(str(value) for value in row[1:])
+
+    def read_rds_table_chunks(
+        self,
+        table_name: str,
+        chunksize: int = 50000,
+        limit: int = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream a table from the RDS database as DataFrame chunks over a server-side cursor,
+        so only one chunk is held in memory at a time. With a cache, a cached table is
+        served from it one Parquet batch at a time, and a full read fills the cache one
+        chunk at a time as it streams.
+
+        Args:
+            table_name (str): Name of the table to read.
+            chunksize (int, optional): Number of rows per chunk. Defaults to 50000.
+            limit (int, optional): Maximum number of rows to read. Defaults to None (all rows).
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the table.
+        """
+        if not self.db_connector:
+            print("No database connection provided.")
+            return
+
+        cache_writer = None
+        if self.cache and limit is None:
+            cache_key, fingerprint = self.table_cache_identity(table_name)
+            cached_chunks = self.cache.get_chunks(cache_key, fingerprint, chunksize)
+            if cached_chunks is not None:
+                yield from cached_chunks
+                return
+            cache_writer = self.cache.writer(cache_key, fingerprint)
+
+        query = f"SELECT * FROM {table_name}"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+
+        with self.db_connector.engine.connect().execution_options(stream_results=True) as connection:
+            try:
+                for chunk in pd.read_sql(text(query), connection, chunksize=chunksize):
+                    # Written before it is yielded, as consumers may clean the chunk in place.
+                    if cache_writer and not cache_writer.write(chunk):
+                        cache_writer = None
+                    yield chunk
+                if cache_writer:
+                    cache_writer.commit()
+                    cache_writer = None
+            finally:
+                # A read that failed or was not consumed to the end is not cached.
+                if cache_writer:
+                    cache_writer.abort()
+
+    def retrieve_pdf_data(self, pages: str = "all") -> pd.DataFrame:
         """
         Retrieve data from a PDF file whose link is specified in config.ini.
 
+        Args:
+            pages (str, optional): Pages to read, e.g. "1-2". Defaults to "all".
+
         Returns:
             pd.DataFrame: A DataFrame of concatenated tables extracted from the PDF,
                           or an empty DataFrame if an error occurs.
@@ -128,7 +274,9 @@ class DataExtractor:
                 print("PDF link not found in config.ini.")
                 return pd.DataFrame()
 
-            df_list = tabula.read_pdf(self.pdf_link, pages="all", multiple_tables=True)
+            import tabula  # Imported lazily: pulls in the Java bridge.
+
+            df_list = tabula.read_pdf(self.pdf_link, pages=pages, multiple_tables=True)
             df = pd.concat(df_list, ignore_index=True)
             return df
         except Exception as e:
@@ -155,55 +303,236 @@ class DataExtractor:
             print(f"Error retrieving number of stores: {e}")
             return 0
 
-    def retrieve_stores_data(self, number_of_stores: int) -> pd.DataFrame:
+    def retrieve_stores_data(
+        self,
+        number_of_stores: int,
+        checkpoint_path: str = "store_details.checkpoint.jsonl"
+    ) -> pd.DataFrame:
         """
         Retrieve the details of each store from the store_details_endpoint in config.ini.
 
+        Fetched stores are checkpointed as they arrive, so a crawl that is
+        interrupted resumes from the missing store numbers on the next call.
+
         Args:
             number_of_stores (int): The number of stores to retrieve.
+            checkpoint_path (str, optional): Path of the crawl checkpoint file.
+                Defaults to "store_details.checkpoint.jsonl".
 
         Returns:
-            pd.DataFrame: A DataFrame containing store details,
+            pd.DataFrame: A DataFrame containing store details ordered by store number,
                           or an empty DataFrame if the endpoint is missing.
         """
         if not self.store_details_endpoint:
             print("Store details endpoint not found in config.ini.")
             return pd.DataFrame()
 
-        stores_data = []
-        for store_number in range(number_of_stores):
-            try:
-                url = f"{self.store_details_endpoint}/{store_number}"
-                response = requests.get(url, headers=self.headers)
-                response.raise_for_status()
-                stores_data.append(response.json())
-            except requests.exceptions.RequestException as e:
-                print(f"Error retrieving data for store number {store_number}: {e}")
+        payloads, _ = self.retrieve_store_payloads(
+            range(number_of_stores), checkpoint_path=checkpoint_path
+        )
+        return pd.DataFrame([payloads[n] for n in sorted(payloads)])
+
+    def retrieve_store_payloads(
+        self,
+        store_numbers: Iterable[int],
+        max_workers: int = 16,
+        checkpoint_path: str = None
+    ) -> tuple:
+        """
+        Fetch the raw store details payloads for the given store numbers concurrently.
+
+        Store numbers that fail are retried once in a final pass. With a checkpoint,
+        every fetched payload is appended to the checkpoint file as it arrives,
+        previously checkpointed store numbers are not fetched again, and the
+        checkpoint is deleted once every store number has been fetched. A checkpoint
+        for a different number of stores, or older than checkpoint_max_age_hours
+        in config.ini, is discarded and the crawl starts over.
 
-        return pd.DataFrame(stores_data)
+        Args:
+            store_numbers (Iterable[int]): The store numbers to fetch.
+            max_workers (int, optional): Number of concurrent requests. Defaults to 16.
+            checkpoint_path (str, optional): Path of the crawl checkpoint file.
+                Defaults to None (no checkpointing).
 
-    def extract_from_s3(self) -> pd.DataFrame:
+        Returns:
+            tuple: A tuple (payloads, failed) where payloads maps store number to the
+                   JSON payload and failed lists the store numbers that could not be fetched.
         """
-        Extract data from an S3 CSV file. The S3 URI is read from config.ini.
+        store_numbers = list(store_numbers)
+        if not self.store_details_endpoint:
+            print("Store details endpoint not found in config.ini.")
+            return {}, store_numbers
+
+        checkpoint = None
+        if checkpoint_path:
+            checkpoint = CrawlCheckpoint(
+                checkpoint_path,
+                run={"number_of_stores": len(store_numbers)},
+                max_age=self.checkpoint_max_age,
+            )
+        payloads = {}
+        if checkpoint:
+            wanted = set(store_numbers)
+            payloads = {n: p for n, p in checkpoint.load().items() if n in wanted}
+            if payloads:
+                print(f"Resuming store crawl: {len(payloads)} of {len(wanted)} stores checkpointed.")
+
+        def fetch(store_number):
+            url = f"{self.store_details_endpoint}/{store_number}"
+            response = requests.get(url, headers=self.headers)
+            response.raise_for_status()
+            return response.json()
+
+        def crawl(pending):
+            failed = []
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(fetch, n): n for n in pending}
+                for future in as_completed(futures):
+                    store_number = futures[future]
+                    try:
+                        payloads[store_number] = future.result()
+                    except requests.exceptions.RequestException as e:
+                        print(f"Error retrieving data for store number {store_number}: {e}")
+                        failed.append(store_number)
+                        continue
+                    if checkpoint:
+                        checkpoint.append(store_number, payloads[store_number])
+            return failed
+
+        try:
+            failed = crawl([n for n in store_numbers if n not in payloads])
+            if failed:
+                print(f"Retrying {len(failed)} failed store numbers.")
+                failed = crawl(failed)
+        finally:
+            if checkpoint:
+                checkpoint.close()
+
+        if checkpoint and not failed:
+            checkpoint.clear()
+
+        return payloads, sorted(failed)
+
+    def _read_s3_object(self, head_bytes: int = None) -> Optional[bytes]:
+        """
+        Download the S3 object whose URI is read from config.ini.
+
+        Args:
+            head_bytes (int, optional): Download only the first `head_bytes` bytes with a
+                ranged GET, cut back to the last complete line. Defaults to None (whole object).
 
         Returns:
-            pd.DataFrame: A DataFrame of the CSV contents,
-                          or an empty DataFrame if an error occurs or the URI is missing.
+            bytes or None: The object contents, or None if an error occurs or the URI is missing.
         """
         if not self.s3_uri:
             print("S3 URI not found in config.ini.")
-            return pd.DataFrame()
+            return None
+
+        import boto3  # Imported lazily: slow to import and only needed here.
 
         bucket_name, s3_file_key = self._parse_s3_uri(self.s3_uri)
         s3_client = boto3.client("s3")
 
         try:
-            response = s3_client.get_object(Bucket=bucket_name, Key=s3_file_key)
-            csv_string = response["Body"].read().decode("utf-8")
-            return pd.read_csv(StringIO(csv_string))
+            if head_bytes is None:
+                response = s3_client.get_object(Bucket=bucket_name, Key=s3_file_key)
+                return response["Body"].read()
+
+            response = s3_client.get_object(
+                Bucket=bucket_name, Key=s3_file_key, Range=f"bytes=0-{int(head_bytes) - 1}"
+            )
+            data = response["Body"].read()
+            if len(data) >= head_bytes:
+                data = data[:data.rfind(b"\n") + 1]
+            return data
         except boto3.exceptions.Boto3Error as e:
             print(f"Error extracting data from S3: {e}")
+            return None
+
+    def extract_from_s3(self, limit: int = None) -> pd.DataFrame:
+        """
+        Extract data from an S3 CSV file. The S3 URI is read from config.ini.
+
+        Args:
+            limit (int, optional): Maximum number of rows to parse. Defaults to None (all rows).
+
+        Returns:
+            pd.DataFrame: A DataFrame of the CSV contents,
+                          or an empty DataFrame if an error occurs or the URI is missing.
+        """
+        data = self._read_s3_object()
+        if data is None:
+            return pd.DataFrame()
+        return pd.read_csv(StringIO(data.decode("utf-8")), nrows=limit)
+
+    def extract_products_from_s3(self, limit: int = None, head_bytes: int = None) -> pd.DataFrame:
+        """
+        Extract the products CSV from S3, parsing prices and dates during the read.
+
+        Args:
+            limit (int, optional): Maximum number of rows to return. Defaults to None (all rows).
+            head_bytes (int, optional): Read only the first `head_bytes` bytes of the object.
+                Defaults to None (whole object).
+
+        Returns:
+            pd.DataFrame: The typed products DataFrame (see parse_products_csv),
+                          or an empty DataFrame if an error occurs or the URI is missing.
+        """
+        data = self._read_s3_object(head_bytes=head_bytes)
+        if data is None:
             return pd.DataFrame()
+        return self.parse_products_csv(data, limit=limit)
+
+    @staticmethod
+    def parse_products_csv(data: bytes, limit: int = None) -> pd.DataFrame:
+        """
+        Parse the products CSV in a single typed pass with pyarrow.
+
+        Only the product columns are read. Null markers become nulls, 'product_price'
+        is parsed to float (stripping '£') by Arrow compute kernels, and text columns
+        stay Arrow-backed strings rather than Python objects. 'date_added' is parsed
+        with DataCleaning.parse_dates, once per distinct value, so dates read exactly
+        as cleaning reads them. Falls back to pd.read_csv when pyarrow is not installed.
+
+        Args:
+            data (bytes): The raw CSV contents.
+            limit (int, optional): Maximum number of rows to return. Defaults to None (all rows).
+
+        Returns:
+            pd.DataFrame: The typed products DataFrame.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.csv as pacsv
+        except ImportError:
+            return pd.read_csv(BytesIO(data), nrows=limit)
+
+        convert_options = pacsv.ConvertOptions(
+            include_columns=PRODUCT_COLUMNS,
+            column_types={column: pa.string() for column in PRODUCT_COLUMNS},
+            null_values=["NULL", "None", "N/A", ""],
+            strings_can_be_null=True,
+        )
+        table = pacsv.read_csv(BytesIO(data), convert_options=convert_options)
+        if limit is not None:
+            table = table.slice(0, limit)
+
+        price = pc.replace_substring(table["product_price"], "£", "")
+        is_number = pc.match_substring_regex(price, r"^\s*-?\d+(\.\d*)?\s*$")
+        price = pc.cast(pc.utf8_trim_whitespace(pc.if_else(is_number, price, pa.scalar(None, pa.string()))), pa.float64())
+
+        table = table.set_column(
+            table.schema.get_field_index("product_price"), "product_price", price
+        )
+
+        def types_mapper(arrow_type):
+            return pd.StringDtype("pyarrow") if arrow_type == pa.string() else None
+
+        df = table.to_pandas(types_mapper=types_mapper)
+        data_cleaner = DataCleaning()
+        df["date_added"] = data_cleaner.parse_unique(df["date_added"], data_cleaner.parse_dates)
+        return df
 
     def extract_json_from_url(self, url: str) -> pd.DataFrame:
         """
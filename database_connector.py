@@ -1,9 +1,10 @@
 # class_2_database_connector.py
 
 import yaml
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, inspect, text, bindparam
 import pandas as pd
-from typing import Optional, Dict
+from io import StringIO
+from typing import Optional, Dict, Iterable
 
 
 class DatabaseConnector:
@@ -11,7 +12,7 @@ class DatabaseConnector:
     Connector class for interacting with a Postgres database via SQLAlchemy.
     """
 
-    def __init__(self, config_path: str = "db_creds.yaml"):
+    def __init__(self, config_path: str = "db_creds.yaml", pool_size: int = 5):
         """
         Initialize the DatabaseConnector with a path to the YAML file containing DB credentials.
 
@@ -19,7 +20,10 @@ class DatabaseConnector:
             config_path (str, optional):
                 Path to the YAML file that contains database credentials.
                 Defaults to "db_creds.yaml".
+            pool_size (int, optional):
+                Number of pooled connections kept open by the engine. Defaults to 5.
         """
+        self.pool_size = pool_size
         self.config = self._read_db_creds(config_path)
         self.engine = self._init_db_engine()
 
@@ -46,7 +50,9 @@ class DatabaseConnector:
 
     def _init_db_engine(self) -> Optional[create_engine]:
         """
-        Initialize a SQLAlchemy engine based on the credentials.
+        Initialize a SQLAlchemy engine based on the credentials. A `DB_URL` entry,
+        if present, is used as the full database URL instead of the RDS_* keys
+        (e.g. a SQLite file for local benchmarks).
 
         Returns:
             create_engine or None: A SQLAlchemy engine if successful, otherwise None.
@@ -56,11 +62,11 @@ class DatabaseConnector:
             return None
 
         try:
-            db_url = (
+            db_url = self.config.get('DB_URL') or (
                 f"postgresql://{self.config['RDS_USER']}:{self.config['RDS_PASSWORD']}"
                 f"@{self.config['RDS_HOST']}:{self.config['RDS_PORT']}/{self.config['RDS_DATABASE']}"
             )
-            engine = create_engine(db_url)
+            engine = create_engine(db_url, pool_size=self.pool_size, pool_pre_ping=True)
             return engine
         except KeyError as e:
             print(f"Missing key in database credentials: {e}")
@@ -105,6 +111,91 @@ class DatabaseConnector:
         except Exception as e:
             print(f"Error uploading data to table {table_name}: {e}")
 
+    def upsert_to_db(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        key_column: str,
+        stale_keys: Iterable = ()
+    ) -> bool:
+        """
+        Replace the rows of `table_name` whose key appears in `df` (or in `stale_keys`)
+        with the rows of `df`, in a single transaction. The table is created if missing.
+
+        Args:
+            df (pd.DataFrame): The DataFrame with new or changed rows.
+            table_name (str): The name of the table to upsert into.
+            key_column (str): The column identifying a row.
+            stale_keys (Iterable, optional): Additional keys to delete, e.g. removed rows
+                or previous keys of changed rows.
+
+        Returns:
+            bool: True if the upsert succeeded, otherwise False.
+        """
+        if not self.engine:
+            print("Database engine is not initialized.")
+            return False
+
+        keys = set(df[key_column].dropna()) if key_column in df.columns else set()
+        keys.update(k for k in stale_keys if k is not None)
+
+        try:
+            with self.engine.begin() as connection:
+                if keys and inspect(connection).has_table(table_name):
+                    query = text(
+                        f'DELETE FROM {table_name} WHERE "{key_column}" IN :keys'
+                    ).bindparams(bindparam("keys", expanding=True))
+                    connection.execute(query, {"keys": list(keys)})
+                if not df.empty:
+                    df.to_sql(table_name, connection, if_exists='append', index=False)
+            print(f"Upserted {len(df)} rows into table {table_name} successfully.")
+            return True
+        except Exception as e:
+            print(f"Error upserting data to table {table_name}: {e}")
+            return False
+
+    def copy_to_db(
+        self,
+        df: pd.DataFrame,
+        table_name: str,
+        schema: str = None,
+        if_exists: str = 'append'
+    ) -> int:
+        """
+        Bulk-load a DataFrame with Postgres COPY, which is much faster than INSERTs.
+
+        Unlike upload_to_db, errors are raised so that streaming callers can stop.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to load.
+            table_name (str): The name of the table to load into.
+            schema (str, optional): The schema of the table. Defaults to None (search path).
+            if_exists (str, optional): 'replace' to (re)create the table from the
+                DataFrame's columns first, or 'append'. Defaults to 'append'.
+
+        Returns:
+            int: The number of rows copied.
+        """
+        if if_exists == 'replace':
+            df.head(0).to_sql(table_name, self.engine, schema=schema, if_exists='replace', index=False)
+
+        buffer = StringIO()
+        df.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+
+        qualified_name = f'"{schema}"."{table_name}"' if schema else f'"{table_name}"'
+        columns = ", ".join(f'"{column}"' for column in df.columns)
+        raw_connection = self.engine.raw_connection()
+        try:
+            with raw_connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {qualified_name} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer
+                )
+            raw_connection.commit()
+        finally:
+            raw_connection.close()
+        return len(df)
+
     def reformat_json_to_df(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Example placeholder method for reformatting JSON stored in a DataFrame.
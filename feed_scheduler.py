@@ -0,0 +1,89 @@
+# feed_scheduler.py
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from data_cleaning import DataCleaning
+from source_adapters import Feed
+
+
+def extract_and_clean(feed: Feed, data_cleaner: DataCleaning, limit: int = None) -> pd.DataFrame:
+    """
+    Extract one feed and run its cleaner, chunk by chunk when the feed is chunked.
+
+    Args:
+        feed (Feed): The feed to run.
+        data_cleaner (DataCleaning): The cleaner providing the feed's cleaning method.
+        limit (int, optional): Maximum number of source rows. Defaults to None (all rows).
+
+    Returns:
+        pd.DataFrame: The cleaned data.
+    """
+    clean = getattr(data_cleaner, feed.cleaner) if feed.cleaner else (lambda df: df)
+    if feed.chunksize:
+        chunks = [clean(chunk) for chunk in feed.adapter.extract_chunks(feed.chunksize, limit=limit)]
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    return clean(feed.adapter.extract(limit=limit))
+
+
+def run_feeds(
+    feeds: List[Feed],
+    data_cleaner: DataCleaning,
+    on_table: Callable[[pd.DataFrame, str], None],
+    max_workers: int = 4,
+    limit: int = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Run the feeds, fanning out those whose adapter supports parallelism, and
+    combine the feeds that share a destination table (e.g. regional feeds of
+    the same kind) into one frame per table.
+
+    A table is only handed to `on_table` if every feed for it succeeded, since
+    loading it would otherwise replace the table with the surviving feeds only.
+
+    Args:
+        feeds (list): The feeds to run.
+        data_cleaner (DataCleaning): The cleaner used by every feed.
+        on_table (Callable): Called with (combined DataFrame, table name) once per table.
+        max_workers (int, optional): Maximum number of feeds run at once. Defaults to 4.
+        limit (int, optional): Maximum number of source rows per feed. Defaults to None.
+
+    Returns:
+        dict: The combined cleaned DataFrame per loadable destination table.
+    """
+    results = {}
+    failed = set()
+
+    def run(feed: Feed):
+        try:
+            results[feed.name] = extract_and_clean(feed, data_cleaner, limit=limit)
+            print(f"Feed {feed.name}: {len(results[feed.name])} cleaned rows.")
+        except Exception as e:
+            print(f"Error running feed {feed.name}: {e}")
+            failed.add(feed.name)
+
+    parallel = [feed for feed in feeds if feed.adapter.supports_parallel]
+    serial = [feed for feed in feeds if not feed.adapter.supports_parallel]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(run, parallel))
+    for feed in serial:
+        run(feed)
+
+    tables = {}
+    failed_tables = {}
+    for feed in feeds:
+        if feed.name in failed:
+            failed_tables.setdefault(feed.table, []).append(feed.name)
+        else:
+            tables.setdefault(feed.table, []).append(results[feed.name])
+    for table_name, feed_names in failed_tables.items():
+        print(f"Not loading {table_name}: feed(s) {', '.join(feed_names)} failed.")
+        tables.pop(table_name, None)
+
+    combined = {}
+    for table_name, frames in tables.items():
+        combined[table_name] = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        on_table(combined[table_name], table_name)
+    return combined
@@ -0,0 +1,239 @@
+# load_manager.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict
+
+import pandas as pd
+from sqlalchemy import text
+
+from database_connector import DatabaseConnector
+
+
+class LoadManager:
+    """
+    Loads several tables in parallel into a shadow schema, then swaps them into
+    the target schema in one short transaction, so readers never see a
+    partially loaded warehouse.
+    """
+
+    def __init__(
+        self,
+        db_connector: DatabaseConnector,
+        target_schema: str = "public",
+        shadow_schema: str = "load_shadow",
+        max_workers: int = 6
+    ):
+        """
+        Initialize the LoadManager.
+
+        Args:
+            db_connector (DatabaseConnector): Connector for the destination database.
+                Its pool should hold at least `max_workers` connections.
+            target_schema (str, optional): Schema readers query. Defaults to "public".
+            shadow_schema (str, optional): Schema tables are loaded into first.
+                It is dropped and recreated on first use. Defaults to "load_shadow".
+            max_workers (int, optional): Number of tables loaded concurrently. Defaults to 6.
+        """
+        self.db_connector = db_connector
+        self.target_schema = target_schema
+        self.shadow_schema = shadow_schema
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.loads: Dict[str, Future] = {}
+        self._schema_ready = False
+        self._lock = threading.Lock()
+
+    def _prepare_shadow_schema(self):
+        """
+        Drop and recreate the shadow schema, once per LoadManager.
+        """
+        with self._lock:
+            if self._schema_ready:
+                return
+            with self.db_connector.engine.begin() as connection:
+                connection.execute(text(f'DROP SCHEMA IF EXISTS "{self.shadow_schema}" CASCADE'))
+                connection.execute(text(f'CREATE SCHEMA "{self.shadow_schema}"'))
+            self._schema_ready = True
+
+    def _load_table(self, df: pd.DataFrame, table_name: str) -> int:
+        """
+        Load one DataFrame into the shadow schema.
+
+        Returns:
+            int: The number of rows loaded.
+        """
+        self._prepare_shadow_schema()
+        df.to_sql(
+            table_name,
+            self.db_connector.engine,
+            schema=self.shadow_schema,
+            if_exists='replace',
+            index=False,
+            chunksize=10000,
+        )
+        return len(df)
+
+    def _claim(self, table_name: str) -> bool:
+        """
+        Reserve `table_name` for one load. A second load of the same table would
+        replace the same shadow table concurrently, so it is rejected.
+        """
+        with self._lock:
+            if table_name in self.loads:
+                print(f"Table {table_name} is already being loaded; not loading it again.")
+                return False
+            self.loads[table_name] = None
+            return True
+
+    def add(self, df: pd.DataFrame, table_name: str) -> bool:
+        """
+        Start loading a DataFrame into the shadow schema in the background.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to load.
+            table_name (str): The table name in the target schema.
+
+        Returns:
+            bool: True if the load was started, False if the table is already being loaded.
+        """
+        if not self.db_connector.engine:
+            print("Database engine is not initialized.")
+            return False
+        if not self._claim(table_name):
+            return False
+        self.loads[table_name] = self.executor.submit(self._load_table, df, table_name)
+        return True
+
+    def run(self, table_name: str, load_func: Callable[[str], int]) -> bool:
+        """
+        Run a custom load (e.g. a streaming pipeline) into the shadow schema in the
+        calling thread, and include its table in the swap.
+
+        Args:
+            table_name (str): The table name in the target schema.
+            load_func (Callable): Called with the shadow schema name; returns the row count.
+
+        Returns:
+            bool: True if the load ran, False if the table is already being loaded.
+        """
+        if not self._claim(table_name):
+            return False
+        future = Future()
+        try:
+            self._prepare_shadow_schema()
+            future.set_result(load_func(self.shadow_schema))
+        except Exception as e:
+            future.set_exception(e)
+        self.loads[table_name] = future
+        return True
+
+    def commit(self) -> bool:
+        """
+        Wait for all loads and, if every one succeeded, move the loaded tables into
+        the target schema in a single transaction, replacing the previous tables.
+        The loaded tables take the column types of the tables they replace, and the
+        primary keys, unique constraints and foreign keys on or into the replaced
+        tables are recreated. If any of these fail (e.g. an orphaned foreign key or
+        a view on a replaced table) the previous tables are left in place.
+
+        Returns:
+            bool: True if the tables were swapped in, otherwise False.
+        """
+        self.executor.shutdown(wait=True)
+        if not self.loads:
+            return True
+
+        failed = []
+        for table_name, future in self.loads.items():
+            try:
+                rows = future.result()
+                print(f"Loaded {rows} rows into {self.shadow_schema}.{table_name}.")
+            except Exception as e:
+                print(f"Error loading table {table_name}: {e}")
+                failed.append(table_name)
+
+        if failed:
+            print(f"Not swapping tables; failed loads: {', '.join(failed)}.")
+            return False
+
+        try:
+            with self.db_connector.engine.begin() as connection:
+                constraints = self._swap_constraints(connection)
+                self._match_column_types(connection)
+                # Every foreign key on or into a swapped table, including those between
+                # swapped tables (orders_table -> dim_users), so the drops below need
+                # no CASCADE and do not depend on the order of self.loads.
+                for schema, table, name, kind, _ in constraints:
+                    if kind == "f":
+                        connection.execute(text(f'ALTER TABLE "{schema}"."{table}" DROP CONSTRAINT "{name}"'))
+                for table_name in self.loads:
+                    # No CASCADE: dependents the swap cannot restore (e.g. views) fail it.
+                    connection.execute(text(
+                        f'DROP TABLE IF EXISTS "{self.target_schema}"."{table_name}"'
+                    ))
+                    connection.execute(text(
+                        f'ALTER TABLE "{self.shadow_schema}"."{table_name}" '
+                        f'SET SCHEMA "{self.target_schema}"'
+                    ))
+                # Keys are restored before the foreign keys that reference them.
+                for schema, table, name, kind, definition in sorted(constraints, key=lambda c: c[3] == "f"):
+                    connection.execute(text(
+                        f'ALTER TABLE "{schema}"."{table}" ADD CONSTRAINT "{name}" {definition}'
+                    ))
+                connection.execute(text(f'DROP SCHEMA "{self.shadow_schema}" CASCADE'))
+            print(f"Swapped tables into {self.target_schema}: {', '.join(self.loads)}.")
+            return True
+        except Exception as e:
+            print(f"Error swapping loaded tables into {self.target_schema}: {e}")
+            return False
+
+    def _swap_constraints(self, connection) -> list:
+        """
+        List the primary key, unique and foreign key constraints on the target tables
+        being replaced, and the foreign keys that reference them, so the swap can
+        recreate them on the new tables.
+
+        Returns:
+            list: Tuples (schema, table, constraint name, type 'p'/'u'/'f', definition).
+        """
+        targets = [f'"{self.target_schema}"."{table_name}"' for table_name in self.loads]
+        rows = connection.execute(text(
+            "SELECT n.nspname, cl.relname, c.conname, c.contype, pg_get_constraintdef(c.oid) "
+            "FROM pg_constraint c "
+            "JOIN pg_class cl ON cl.oid = c.conrelid "
+            "JOIN pg_namespace n ON n.oid = cl.relnamespace "
+            "WHERE c.contype IN ('p', 'u', 'f') "
+            "AND (c.conrelid = ANY(CAST(:targets AS regclass[])) "
+            "OR c.confrelid = ANY(CAST(:targets AS regclass[])))"
+        ), {"targets": [t for t in targets if self._exists(connection, t)]})
+        return [tuple(row) for row in rows]
+
+    def _match_column_types(self, connection):
+        """
+        Cast the columns of each loaded table to the types of the table it replaces
+        (e.g. UUID or VARCHAR(n) set by modelling.sql), so restored keys still apply.
+        """
+        for table_name in self.loads:
+            target = f'"{self.target_schema}"."{table_name}"'
+            if not self._exists(connection, target):
+                continue
+            shadow = f'"{self.shadow_schema}"."{table_name}"'
+            target_types = self._column_types(connection, target)
+            for column, column_type in self._column_types(connection, shadow).items():
+                wanted = target_types.get(column)
+                if wanted and wanted != column_type:
+                    connection.execute(text(
+                        f'ALTER TABLE {shadow} ALTER COLUMN "{column}" TYPE {wanted} USING "{column}"::{wanted}'
+                    ))
+
+    @staticmethod
+    def _exists(connection, table: str) -> bool:
+        return connection.execute(text("SELECT to_regclass(:table)"), {"table": table}).scalar() is not None
+
+    @staticmethod
+    def _column_types(connection, table: str) -> Dict[str, str]:
+        rows = connection.execute(text(
+            "SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+            "WHERE attrelid = CAST(:table AS regclass) AND attnum > 0 AND NOT attisdropped"
+        ), {"table": table})
+        return dict(rows.fetchall())
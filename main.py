@@ -1,187 +1,695 @@
+"""
+Entry point for the retail data centralisation pipeline.
+
+Heavy dependencies (pandas, SQLAlchemy, boto3, tabula) are imported inside the
+stage functions, so running a single stage only pays for what that stage uses.
+
+Usage:
+    python main.py                  # run every stage
+    python main.py stores products  # run the selected stages only
+    python main.py orders --limit 1000 --no-upload --profile profiles/
+    python main.py --preview        # clean a small sample of every source and report nulls/drops
+"""
+
+import argparse
 import configparser
-import yaml  # <-- We use PyYAML to load from .yaml
-import re
-import requests
-import pandas as pd
+import inspect
+import time
+from contextlib import nullcontext
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def load_config(path: str = "config.ini") -> configparser.ConfigParser:
+    """
+    Read config.ini once, on first use.
 
-from database_connector import DatabaseConnector
-from data_extractor import DataExtractor
-from data_cleaning import DataCleaning
-import pkg_resources
+    Args:
+        path (str, optional): Path to the config file. Defaults to "config.ini".
 
-# 1. Load config.ini
-config = configparser.ConfigParser()
-config.read("config.ini")  # Update path if needed
+    Returns:
+        configparser.ConfigParser: The parsed configuration.
+    """
+    config = configparser.ConfigParser()
+    config.read(path)
+    return config
+
+
+def deduplicate_table(data_cleaner, df, table_name: str):
+    """
+    Deduplicate a cleaned table on its primary key, using the keep-policy
+    from the [DEDUP] section of config.ini.
 
-# 2. Load the API key from api_conn.yaml
-with open('api_conn.yaml', 'r') as f:
-    api_config = yaml.safe_load(f)
+    Args:
+        data_cleaner (DataCleaning): The DataCleaning instance.
+        df (pd.DataFrame): The cleaned DataFrame.
+        table_name (str): The destination table name.
 
-# Extract endpoints from config.ini
-STORES_ENDPOINT = config["API"]["stores_endpoint"]
-STORE_DETAILS_ENDPOINT = config["API"]["store_details_endpoint"]
-PDF_LINK = config["API"]["pdf_link"]
-S3_URI = config["API"]["s3_uri"]
-JSON_URL = config["API"]["json_url"]
+    Returns:
+        pd.DataFrame: The deduplicated DataFrame, or `df` if the table has no policy.
+    """
+    config = load_config()
+    if not config.has_option("DEDUP", table_name):
+        return df
 
-# Extract the API key from the YAML file
-API_KEY = api_config['api_key']
-HEADERS = {"x-api-key": API_KEY}
+    policy = [part.strip() for part in config["DEDUP"][table_name].split(",") if part.strip()]
+    key_column = policy[0]
+    order_by = policy[1] if len(policy) > 1 else None
+    return data_cleaner.deduplicate(df, key_column, order_by)
 
 
-def users_clean():
+def make_cleaner():
+    """
+    Create a DataCleaning instance, instrumented when a memory monitor is active.
+
+    Returns:
+        DataCleaning: The cleaner.
+    """
+    from data_cleaning import DataCleaning
+    from memory_monitor import get_active_monitor
+
+    data_cleaner = DataCleaning()
+    monitor = get_active_monitor()
+    return monitor.instrument(data_cleaner) if monitor else data_cleaner
+
+
+def load_table(df, table_name: str, loader=None):
+    """
+    Hand a cleaned table to the batched loader, or upload it directly if there is none.
+
+    Args:
+        df (pd.DataFrame): The cleaned DataFrame.
+        table_name (str): The destination table name.
+        loader (LoadManager, optional): Batched loader. Defaults to None.
+    """
+    from memory_monitor import get_active_monitor
+
+    monitor = get_active_monitor()
+    with monitor.step(f"upload:{table_name}") if monitor else nullcontext():
+        if loader is not None:
+            loader.add(df, table_name)
+            return
+
+        from database_connector import DatabaseConnector
+
+        local_db_connector = DatabaseConnector(config_path='local_db_creds.yaml')
+        local_db_connector.upload_to_db(df, table_name)
+
+
+def preview_settings():
+    """
+    Read the preview sample bounds from the [PREVIEW] section of config.ini.
+
+    Returns:
+        PreviewSettings: The sample bounds.
+    """
+    from preview import PreviewSettings
+
+    return PreviewSettings.from_config(load_config())
+
+
+def preview_table(data_cleaner, raw_df, clean, table_name: str):
+    """
+    Clean and deduplicate a sampled source like a full run would, and report its
+    null and drop statistics instead of loading it.
+
+    Args:
+        data_cleaner (DataCleaning): The DataCleaning instance.
+        raw_df (pd.DataFrame): The sampled source data.
+        clean (Callable): The stage's cleaning, applied to a copy of `raw_df`.
+        table_name (str): The destination table name.
+    """
+    from preview import report_preview
+
+    if raw_df is None or raw_df.empty:
+        print(f"No rows sampled for {table_name}.")
+        return
+    # Cleaning may assign columns on the frame it is given, so it gets a copy of the
+    # (bounded) sample and the raw statistics are taken from the untouched original.
+    cleaned_df = deduplicate_table(data_cleaner, clean(raw_df.copy()), table_name)
+    report_preview(table_name, raw_df, cleaned_df)
+
+
+def users_clean(
+    limit: int = None,
+    upload: bool = True,
+    loader=None,
+    chunked: bool = False,
+    preview: bool = False
+):
     """
     Cleans the user data from the AWS RDS database and uploads it 
     into a local database as 'dim_users'.
+
+    Args:
+        limit (int, optional): Maximum number of source rows to process. Defaults to None (all).
+        upload (bool, optional): Write the result to the local database. Defaults to True.
+        loader (LoadManager, optional): Batched loader to hand the table to.
+            Defaults to None (upload directly).
+        chunked (bool, optional): Read and clean the table in chunks to bound memory.
+            Defaults to False.
+        preview (bool, optional): Clean a bounded sample of the source and report null
+            and drop statistics instead of loading. Defaults to False.
     """
+    from database_connector import DatabaseConnector
+    from data_extractor import DataExtractor
+    from table_cache import TableCache
+
     rds_db_connector = DatabaseConnector(config_path='aws_db_creds.yaml')
-    data_extractor = DataExtractor(rds_db_connector)
+    data_extractor = DataExtractor(rds_db_connector, cache=TableCache.from_config(load_config()))
+    target_table = 'legacy_users'
+
+    if preview:
+        settings = preview_settings()
+        df = data_extractor.sample_rds_table(target_table, settings.rds_sample_percent, settings.rows)
+        data_cleaner = make_cleaner()
+        preview_table(data_cleaner, df, data_cleaner.clean_user_data, "dim_users")
+        return
+
     tables = data_extractor.list_tables()
 
-    target_table = 'legacy_users'
+    if target_table in tables and chunked:
+        import pandas as pd
+
+        data_cleaner = make_cleaner()
+        cleaned_chunks = [
+            data_cleaner.clean_user_data(chunk)
+            for chunk in data_extractor.read_rds_table_chunks(target_table, limit=limit)
+        ]
+        if cleaned_chunks:
+            cleaned_df = pd.concat(cleaned_chunks, ignore_index=True)
+            cleaned_df = deduplicate_table(data_cleaner, cleaned_df, "dim_users")
+            print("Data after cleaning:")
+            print(cleaned_df.head())
 
-    if target_table in tables:
-        df = data_extractor.read_rds_table(target_table)
+            if upload:
+                load_table(cleaned_df, "dim_users", loader)
+    elif target_table in tables:
+        df = data_extractor.read_rds_table(target_table, limit=limit)
         if df is not None:
             print("Data before cleaning:")
             print(df.head())
 
-            data_cleaner = DataCleaning()
+            data_cleaner = make_cleaner()
             cleaned_df = data_cleaner.clean_user_data(df)
+            cleaned_df = deduplicate_table(data_cleaner, cleaned_df, "dim_users")
             print("Data after cleaning:")
             print(cleaned_df.head())
 
-            local_db_connector = DatabaseConnector(config_path='local_db_creds.yaml')
-            local_db_connector.upload_to_db(cleaned_df, "dim_users")
+            if upload:
+                load_table(cleaned_df, "dim_users", loader)
     else:
         print(f"Table {target_table} not found in the database.")
 
 
-def card_details_clean():
+def card_details_clean(limit: int = None, upload: bool = True, loader=None, preview: bool = False):
     """
     Cleans the card details data from a PDF file and uploads it 
     into a local database as 'dim_card_details'.
+
+    Args:
+        limit (int, optional): Maximum number of source rows to process. Defaults to None (all).
+        upload (bool, optional): Write the result to the local database. Defaults to True.
+        loader (LoadManager, optional): Batched loader to hand the table to.
+            Defaults to None (upload directly).
+        preview (bool, optional): Clean a bounded sample of the source and report null
+            and drop statistics instead of loading. Defaults to False.
     """
+    from data_extractor import DataExtractor
+
     data_extractor = DataExtractor()
+    data_cleaner = make_cleaner()
+
+    def clean(df):
+        df = data_cleaner.standardize_nulls(df)
+        df = data_cleaner.clean_card_number(df)
+        df = data_cleaner.clean_dates(df, date_columns=['date_payment_confirmed'])
+        return data_cleaner.remove_invalid_rows(df)
+
+    if preview:
+        settings = preview_settings()
+        pdf_data_df = data_extractor.retrieve_pdf_data(pages=f"1-{settings.pdf_pages}").head(settings.rows)
+        preview_table(data_cleaner, pdf_data_df, clean, "dim_card_details")
+        return
+
     pdf_data_df = data_extractor.retrieve_pdf_data()  # No PDF_LINK argument
+    if limit is not None:
+        pdf_data_df = pdf_data_df.head(limit)
 
     if pdf_data_df is not None:
         print("Data before cleaning:")
         print(pdf_data_df.head())
 
-        data_cleaner = DataCleaning()
-        cleaned_df = data_cleaner.standardize_nulls(pdf_data_df)
-        cleaned_df = data_cleaner.clean_card_number(cleaned_df)
-        cleaned_df = data_cleaner.clean_dates(cleaned_df, date_columns=['date_payment_confirmed'])
-        cleaned_df = data_cleaner.remove_invalid_rows(cleaned_df)
+        cleaned_df = clean(pdf_data_df)
+        cleaned_df = deduplicate_table(data_cleaner, cleaned_df, "dim_card_details")
 
         print("Final cleaned data:")
         print(cleaned_df.head())
 
-        local_db_connector = DatabaseConnector(config_path='local_db_creds.yaml')
-        local_db_connector.upload_to_db(cleaned_df, "dim_card_details")
+        if upload:
+            load_table(cleaned_df, "dim_card_details", loader)
     else:
         print("Failed to retrieve data from the PDF.")
 
 
-def stores_clean():
+def stores_clean(limit: int = None, upload: bool = True, loader=None, preview: bool = False):
     """
-    Cleans store details retrieved via API endpoints and uploads it 
-    into a local database as 'dim_store_details'.
+    Cleans store details retrieved via API endpoints and upserts the stores
+    that are new or changed since the last run into 'dim_store_details'.
+
+    Args:
+        limit (int, optional): Maximum number of source rows to process. Defaults to None (all).
+        upload (bool, optional): Write the result to the local database. Defaults to True.
+        loader (LoadManager, optional): Unused; store changes are upserted in place
+            rather than swapped in with the batched load.
+        preview (bool, optional): Clean the first stores and report null and drop
+            statistics, without comparing against or updating the snapshots. Defaults to False.
     """
+    import pandas as pd
+    from database_connector import DatabaseConnector
+    from data_extractor import DataExtractor
+    from store_snapshot import StoreSnapshotStore
+    from crawl_checkpoint import CrawlCheckpoint
+
     data_extractor = DataExtractor()
 
     number_of_stores = data_extractor.list_number_of_stores()
     print(f"Number of stores: {number_of_stores}")
 
-    if number_of_stores:
-        stores_df = data_extractor.retrieve_stores_data(number_of_stores)
+    if not number_of_stores:
+        print("Failed to retrieve number of stores.")
+        return
+
+    if preview:
+        settings = preview_settings()
+        payloads, _ = data_extractor.retrieve_store_payloads(range(min(settings.stores, number_of_stores)))
+        stores_df = pd.DataFrame([payloads[n] for n in sorted(payloads)])
+        data_cleaner = make_cleaner()
+        preview_table(
+            data_cleaner,
+            stores_df,
+            lambda df: data_cleaner.normalize_comma_spacing(data_cleaner.clean_store_details(df)),
+            "dim_store_details",
+        )
+        return
+
+    snapshot_store = StoreSnapshotStore()
+    # Removed stores are still judged against the full count when limiting.
+    fetch_count = number_of_stores if limit is None else min(limit, number_of_stores)
+    checkpoint_path = "store_details.checkpoint.jsonl"
+    payloads, failed = data_extractor.retrieve_store_payloads(range(fetch_count), checkpoint_path=checkpoint_path)
+    delta = snapshot_store.diff(payloads, number_of_stores)
+    print(
+        f"Stores unchanged: {len(delta['unchanged'])}, changed: {len(delta['changed'])}, "
+        f"new: {len(delta['new'])}, removed: {len(delta['removed'])}, failed: {len(failed)}"
+    )
+
+    to_load = delta['new'] + delta['changed']
+    if not to_load and not delta['removed']:
+        print("No store changes detected.")
+        # Stores that failed for good are fetched afresh next run, not resumed.
+        CrawlCheckpoint(checkpoint_path).clear()
+        return
+
+    # Previous codes of changed and removed stores are deleted before the upsert.
+    stale_codes = [
+        snapshot_store.previous_payload(n).get('store_code')
+        for n in delta['changed'] + delta['removed']
+    ]
+
+    stores_df = pd.DataFrame([payloads[n] for n in to_load])
+    cleaned_df = stores_df
+    if not stores_df.empty:
         print("Data before cleaning:")
         print(stores_df.head())
 
-        data_cleaner = DataCleaning()
+        data_cleaner = make_cleaner()
         cleaned_df = data_cleaner.clean_store_details(stores_df)
-        cleaned_df = cleaned_df.applymap(lambda x: re.sub(r',\s*', ', ', x) if isinstance(x, str) else x)
+        cleaned_df = data_cleaner.normalize_comma_spacing(cleaned_df)
+        cleaned_df = deduplicate_table(data_cleaner, cleaned_df, "dim_store_details")
 
         print("Data after cleaning:")
         print(cleaned_df.head())
 
-        local_db_connector = DatabaseConnector(config_path='local_db_creds.yaml')
-        local_db_connector.upload_to_db(cleaned_df, "dim_store_details")
-    else:
-        print("Failed to retrieve number of stores.")
+    if not upload:
+        return
+
+    local_db_connector = DatabaseConnector(config_path='local_db_creds.yaml')
+    if local_db_connector.upsert_to_db(cleaned_df, "dim_store_details", 'store_code', stale_codes):
+        snapshot_store.update({n: payloads[n] for n in to_load}, delta['removed'])
+        snapshot_store.save()
+        CrawlCheckpoint(checkpoint_path).clear()
 
 
-def product_clean():
+def product_clean(limit: int = None, upload: bool = True, loader=None, preview: bool = False):
     """
     Cleans the product data retrieved from an S3 CSV file 
     and uploads it into a local database as 'dim_products'.
+
+    Args:
+        limit (int, optional): Maximum number of source rows to process. Defaults to None (all).
+        upload (bool, optional): Write the result to the local database. Defaults to True.
+        loader (LoadManager, optional): Batched loader to hand the table to.
+            Defaults to None (upload directly).
+        preview (bool, optional): Clean a bounded sample of the source and report null
+            and drop statistics instead of loading. Defaults to False.
     """
+    from data_extractor import DataExtractor
+
     data_extractor = DataExtractor()
-    products_df = data_extractor.extract_from_s3()
+    if preview:
+        settings = preview_settings()
+        products_df = data_extractor.extract_products_from_s3(
+            limit=settings.rows, head_bytes=settings.s3_head_bytes
+        )
+        data_cleaner = make_cleaner()
+        preview_table(data_cleaner, products_df, data_cleaner.clean_product_data, "dim_products")
+        return
+
+    products_df = data_extractor.extract_products_from_s3(limit=limit)
     print("Data before cleaning:")
     print(products_df.head())
 
-    data_cleaner = DataCleaning()
+    data_cleaner = make_cleaner()
     cleaned_df = data_cleaner.clean_product_data(products_df)
+    cleaned_df = deduplicate_table(data_cleaner, cleaned_df, "dim_products")
 
     print("Data after cleaning:")
     print(cleaned_df.head())
 
-    local_db_connector = DatabaseConnector(config_path='local_db_creds.yaml')
-    local_db_connector.upload_to_db(cleaned_df, "dim_products")
+    if upload:
+        load_table(cleaned_df, "dim_products", loader)
 
 
-def orders_clean():
+def orders_clean(limit: int = None, upload: bool = True, loader=None, preview: bool = False):
     """
-    Cleans the orders data from the AWS RDS database and uploads it 
-    into a local database as 'orders_table'.
+    Streams the orders data from the AWS RDS database in chunks, cleans the chunks
+    in parallel and COPYs them into a local database as 'orders_table'.
+
+    Args:
+        limit (int, optional): Maximum number of source rows to process. Defaults to None (all).
+        upload (bool, optional): Write the result to the local database. Defaults to True.
+        loader (LoadManager, optional): Batched loader; the table is streamed into its
+            shadow schema. Defaults to None (stream into the local database directly).
+        preview (bool, optional): Clean a TABLESAMPLE sample of the table and report null
+            and drop statistics instead of loading. Defaults to False.
     """
-    rds_db_connector = DatabaseConnector(config_path='aws_db_creds.yaml')
-    data_extractor = DataExtractor(rds_db_connector)
-    orders_df = data_extractor.read_rds_table('orders_table')
-    print("Data before cleaning:")
-    print(orders_df.head())
+    from database_connector import DatabaseConnector
+    from data_extractor import DataExtractor
+    from chunked_pipeline import ChunkedPipeline, CopySink
+    from table_cache import TableCache
 
-    data_cleaner = DataCleaning()
-    cleaned_df = data_cleaner.clean_orders_data(orders_df)
-    print("Data after cleaning:")
-    print(cleaned_df.head())
-
-    local_db_connector = DatabaseConnector(config_path='local_db_creds.yaml')
-    local_db_connector.upload_to_db(cleaned_df, "orders_table")
+    rds_db_connector = DatabaseConnector(config_path='aws_db_creds.yaml')
+    data_extractor = DataExtractor(rds_db_connector, cache=TableCache.from_config(load_config()))
+    data_cleaner = make_cleaner()
+
+    if preview:
+        settings = preview_settings()
+        df = data_extractor.sample_rds_table('orders_table', settings.rds_sample_percent, settings.rows)
+        preview_table(data_cleaner, df, data_cleaner.clean_orders_data, "orders_table")
+        return
+
+    def run_pipeline(sink) -> int:
+        previewed = False
+
+        def preview_and_sink(chunk):
+            nonlocal previewed
+            if not previewed:
+                print("Data after cleaning (first chunk):")
+                print(chunk.head())
+                previewed = True
+            if sink is not None:
+                sink(chunk)
+
+        pipeline = ChunkedPipeline(
+            data_extractor.read_rds_table_chunks('orders_table', limit=limit),
+            data_cleaner.clean_orders_data,
+            preview_and_sink,
+        )
+        if not pipeline.run():
+            raise RuntimeError("Orders pipeline failed.")
+        return sink.rows if sink is not None else 0
+
+    if not upload:
+        run_pipeline(None)
+    elif loader is not None:
+        loader.run(
+            "orders_table",
+            lambda schema: run_pipeline(CopySink(loader.db_connector, "orders_table", schema)),
+        )
+    else:
+        local_db_connector = DatabaseConnector(config_path='local_db_creds.yaml')
+        try:
+            rows = run_pipeline(CopySink(local_db_connector, "orders_table"))
+            print(f"Data uploaded to table orders_table successfully ({rows} rows).")
+        except Exception as e:
+            print(f"Error uploading data to table orders_table: {e}")
 
 
-def dates_clean():
+def dates_clean(limit: int = None, upload: bool = True, loader=None, preview: bool = False):
     """
     Cleans the dates data retrieved from a JSON file (fetched from S3) 
     and uploads it into a local database as 'dim_date_times'.
+
+    Args:
+        limit (int, optional): Maximum number of source rows to process. Defaults to None (all).
+        upload (bool, optional): Write the result to the local database. Defaults to True.
+        loader (LoadManager, optional): Batched loader to hand the table to.
+            Defaults to None (upload directly).
+        preview (bool, optional): Clean a bounded sample of the source and report null
+            and drop statistics instead of loading. Defaults to False.
     """
-    data_cleaner = DataCleaning()
-    raw_json_data = data_cleaner.fetch_and_save_json(JSON_URL, "date_details.json")
+
+    data_cleaner = make_cleaner()
+    raw_json_data = data_cleaner.fetch_and_save_json(
+        load_config()["API"]["json_url"], "date_details.json"
+    )
+
+    if preview:
+        limit = preview_settings().rows
 
     if raw_json_data:
+        if limit is not None:
+            keys = list(raw_json_data['timestamp'])[:limit]
+            raw_json_data = {
+                column: {key: values[key] for key in keys}
+                for column, values in raw_json_data.items()
+            }
+        if preview:
+            preview_table(
+                data_cleaner,
+                data_cleaner.reformat_json_to_df(raw_json_data),
+                lambda _: data_cleaner.clean_date_events_data(raw_json_data),
+                "dim_date_times",
+            )
+            return
         cleaned_df = data_cleaner.clean_date_events_data(raw_json_data)
         if cleaned_df is not None:
+            cleaned_df = deduplicate_table(data_cleaner, cleaned_df, "dim_date_times")
             print("Final cleaned data:")
             print(cleaned_df.head())
 
-            local_db_connector = DatabaseConnector(config_path='local_db_creds.yaml')
-            local_db_connector.upload_to_db(cleaned_df, "dim_date_times")
+            if upload:
+                load_table(cleaned_df, "dim_date_times", loader)
+
+
+def feeds_clean(limit: int = None, upload: bool = True, loader=None, preview: bool = False):
+    """
+    Runs the source feeds configured as [FEED <name>] sections in config.ini,
+    extracting feeds concurrently where their adapters allow it and loading one
+    combined table per destination.
+
+    Args:
+        limit (int, optional): Maximum number of source rows per feed. Defaults to None (all).
+        upload (bool, optional): Write the result to the local database. Defaults to True.
+        loader (LoadManager, optional): Batched loader to hand the tables to.
+            Defaults to None (upload directly).
+        preview (bool, optional): Clean at most [PREVIEW] rows per feed and report
+            null statistics instead of loading. Defaults to False.
+    """
+    from feed_scheduler import run_feeds
+    from source_adapters import load_feeds
+
+    config = load_config()
+    feeds = load_feeds(config)
+    if not feeds:
+        print("No feeds configured in config.ini.")
+        return
+
+    data_cleaner = make_cleaner()
+
+    if preview:
+        limit = preview_settings().rows
+
+    def on_table(cleaned_df, table_name):
+        cleaned_df = deduplicate_table(data_cleaner, cleaned_df, table_name)
+        if preview:
+            from preview import report_preview
+
+            report_preview(table_name, None, cleaned_df)
+            return
+        print(f"Data after cleaning ({table_name}):")
+        print(cleaned_df.head())
+        if upload:
+            load_table(cleaned_df, table_name, loader)
+
+    run_feeds(
+        feeds,
+        data_cleaner,
+        on_table,
+        max_workers=config.getint("FEEDS", "max_workers", fallback=4),
+        limit=limit,
+    )
+
+
+STAGES = {
+    "users": users_clean,
+    "cards": card_details_clean,
+    "stores": stores_clean,
+    "products": product_clean,
+    "orders": orders_clean,
+    "dates": dates_clean,
+    "feeds": feeds_clean,
+}
+
+
+def run_stage(name: str, stage, monitor=None, **kwargs):
+    """
+    Run one stage, under the memory monitor if there is one. When the stage exceeds
+    its budget and the monitor's policy is 'chunk', stages that support chunked
+    mode are rerun in it, unless they already handed their table to the loader;
+    otherwise the run stops.
+
+    Args:
+        name (str): The stage name.
+        stage (Callable): The stage function.
+        monitor (MemoryMonitor, optional): The active memory monitor. Defaults to None.
+        **kwargs: Arguments passed to the stage.
+    """
+    if monitor is None:
+        stage(**kwargs)
+        return
+
+    from memory_monitor import MemoryBudgetExceeded
+
+    loader = kwargs.get("loader")
+    loading_before = set(loader.loads) if loader is not None else set()
+    try:
+        with monitor.stage(name):
+            stage(**kwargs)
+    except MemoryBudgetExceeded as e:
+        if monitor.on_exceed != "chunk" or "chunked" not in inspect.signature(stage).parameters:
+            raise
+        if loader is not None and set(loader.loads) - loading_before:
+            # The budget was exceeded by the upload step, after the table was
+            # handed off; a rerun would only load it a second time.
+            print(f"{e}. Stage {name} already handed its table to the loader; not rerunning it.")
+            return
+        print(f"{e}. Rerunning stage {name} in chunked mode.")
+        with monitor.stage(name):
+            stage(chunked=True, **kwargs)
+
+
+def main(argv=None):
+    """
+    Parse the command line and run the selected stages in pipeline order.
+
+    Args:
+        argv (list, optional): Command line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Run the retail data centralisation pipeline.")
+    parser.add_argument(
+        "stages",
+        nargs="*",
+        metavar="STAGE",
+        help=f"Stages to run, any of: {', '.join(STAGES)}. Defaults to all.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of source rows each stage processes.",
+    )
+    parser.add_argument(
+        "--no-upload",
+        "--dry-run",
+        dest="upload",
+        action="store_false",
+        help="Extract and clean only; do not write to the local database.",
+    )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="Clean a small sample of each source (bounded by [PREVIEW] in config.ini) and "
+             "report column null and row drop statistics; nothing is uploaded.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIR",
+        default=None,
+        help="Profile each stage with cProfile and tracemalloc, writing the results to DIR.",
+    )
+    parser.add_argument(
+        "--memory",
+        metavar="REPORT",
+        default=None,
+        help="Record memory around every cleaning step and upload, enforce the [MEMORY] "
+             "budgets from config.ini, and write the top allocating steps to REPORT.",
+    )
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    if args.preview:
+        args.upload = False
+
+    import pandas as pd
+
+    # DataCleaning avoids defensive copies by relying on copy-on-write (see its docstring).
+    pd.set_option('mode.copy_on_write', True)
+
+    loader = None
+    if args.upload:
+        from database_connector import DatabaseConnector
+        from load_manager import LoadManager
+
+        # Tables are loaded in the background while later stages run, then
+        # swapped in together once every stage has finished.
+        loader = LoadManager(DatabaseConnector(config_path='local_db_creds.yaml', pool_size=len(STAGES)))
+
+    monitor = None
+    if args.memory:
+        from memory_monitor import MemoryMonitor
+
+        monitor = MemoryMonitor.from_config(load_config())
+        monitor.activate()
+
+    selected = args.stages or list(STAGES)
+    stage_kwargs = dict(limit=args.limit, upload=args.upload, loader=loader, preview=args.preview)
+    try:
+        for name, stage in STAGES.items():
+            if name not in selected:
+                continue
+            start = time.perf_counter()
+            if args.profile:
+                from profiling import profile_stage
+
+                with profile_stage(name, args.profile):
+                    run_stage(name, stage, monitor, **stage_kwargs)
+            else:
+                run_stage(name, stage, monitor, **stage_kwargs)
+            if args.preview:
+                print(f"Preview of stage {name} took {time.perf_counter() - start:.1f}s.")
+
+        if loader is not None:
+            with monitor.step("upload:commit") if monitor else nullcontext():
+                loader.commit()
+    finally:
+        if monitor is not None:
+            monitor.report(args.memory)
 
 
 if __name__ == "__main__":
-    # Example usage:
-    users_clean()
-    card_details_clean()
-    stores_clean()
-    product_clean()
-    orders_clean()
-    dates_clean()
-
-    def export_requirements():
-        with open('requirements.txt', 'w') as f:
-            for dist in pkg_resources.working_set:
-                f.write(f"{dist.project_name}=={dist.version}\n")
-
-    export_requirements()
\ No newline at end of file
+    main()
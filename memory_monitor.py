@@ -0,0 +1,244 @@
+# memory_monitor.py
+
+import functools
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+_active_monitor = None
+
+# Methods recorded as steps by MemoryMonitor.instrument: the pipeline-level
+# DataCleaning steps, not the per-cell helpers they call (a step costs two
+# tracemalloc snapshots).
+INSTRUMENTED_PREFIXES = ("clean_", "standardize_nulls", "remove_invalid_rows", "deduplicate")
+
+
+class MemoryBudgetExceeded(Exception):
+    """
+    Raised when a pipeline stage exceeds its configured memory budget.
+    """
+
+    def __init__(self, stage: str, step: str, peak_bytes: int, budget_bytes: int):
+        self.stage = stage
+        self.step = step
+        self.peak_bytes = peak_bytes
+        self.budget_bytes = budget_bytes
+        super().__init__(
+            f"Stage {stage} exceeded its memory budget in step {step}: "
+            f"{peak_bytes / 1024 ** 2:.0f} MiB > {budget_bytes / 1024 ** 2:.0f} MiB"
+        )
+
+
+def current_rss() -> int:
+    """
+    Return the resident set size of this process in bytes (0 if unavailable).
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def get_active_monitor() -> Optional["MemoryMonitor"]:
+    """
+    Return the monitor activated for this run, if any.
+    """
+    return _active_monitor
+
+
+class MemoryMonitor:
+    """
+    Records RSS and tracemalloc statistics around pipeline steps and enforces
+    per-stage memory budgets. A budget limits how much a stage grows the process,
+    measured from the RSS when the stage started, so memory still held from
+    earlier stages (e.g. tables waiting for the background upload) does not count.
+
+    Only steps run on the main thread are recorded; work on pipeline worker
+    threads is attributed to the step that waits for it.
+    """
+
+    def __init__(
+        self,
+        budgets: Dict[str, int] = None,
+        on_exceed: str = "fail",
+        top_lines: int = 3
+    ):
+        """
+        Initialize the MemoryMonitor.
+
+        Args:
+            budgets (dict, optional): Peak memory growth budget in bytes per stage name.
+                Defaults to None (no budgets).
+            on_exceed (str, optional): 'fail' to stop the run when a budget is exceeded,
+                or 'chunk' to rerun stages that support it in chunked mode. Defaults to 'fail'.
+            top_lines (int, optional): Number of top allocating source lines kept per step.
+                Defaults to 3.
+        """
+        self.budgets = budgets or {}
+        self.on_exceed = on_exceed
+        self.top_lines = top_lines
+        self.records = []
+        self.stage_name = None
+        self._stage_rss_before = 0
+        self._stack = []
+
+    @classmethod
+    def from_config(cls, config) -> "MemoryMonitor":
+        """
+        Build a MemoryMonitor from the [MEMORY] section of config.ini, where each
+        stage's budget is given in MiB.
+
+        Args:
+            config (configparser.ConfigParser): The parsed config.ini.
+
+        Returns:
+            MemoryMonitor: The configured monitor.
+        """
+        if not config.has_section("MEMORY"):
+            return cls()
+        section = config["MEMORY"]
+        budgets = {
+            stage: int(float(value) * 1024 ** 2)
+            for stage, value in section.items()
+            if stage != "on_exceed"
+        }
+        return cls(budgets=budgets, on_exceed=section.get("on_exceed", "fail"))
+
+    def activate(self):
+        """
+        Start tracing and make this the monitor returned by get_active_monitor().
+        """
+        global _active_monitor
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _active_monitor = self
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Attribute the steps run inside the block to stage `name` and check its budget.
+        """
+        previous = self.stage_name, self._stage_rss_before
+        self.stage_name, self._stage_rss_before = name, current_rss()
+        try:
+            with self.step(name):
+                yield
+        finally:
+            self.stage_name, self._stage_rss_before = previous
+
+    @contextmanager
+    def step(self, name: str):
+        """
+        Record RSS and traced memory around the block, then enforce the stage budget.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            yield
+            return
+
+        if self._stack:
+            # Resetting the peak below would lose the parent's peak so far.
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+        frame = {"name": name, "peak": 0, "snapshot": self._snapshot() if self.top_lines else None}
+        traced_before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        rss_before = current_rss()
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            traced_after, peak = tracemalloc.get_traced_memory()
+            rss_after = current_rss()
+            self._stack.pop()
+            peak = max(peak, frame["peak"])
+            if self._stack:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+
+            top = []
+            if frame["snapshot"] is not None:
+                stats = self._snapshot().compare_to(frame["snapshot"], "lineno")
+                top = [str(stat) for stat in stats[:self.top_lines]]
+
+            path = "/".join([parent["name"] for parent in self._stack] + [name])
+            peak_estimate = max(rss_after, rss_before + peak - traced_before)
+            record = {
+                "stage": self.stage_name,
+                "step": path,
+                "rss_before": rss_before,
+                "rss_after": rss_after,
+                "traced_growth": traced_after - traced_before,
+                "traced_peak_growth": peak - traced_before,
+                "peak_estimate": peak_estimate,
+                # Growth over the process size when the stage started; what budgets limit.
+                "stage_growth": peak_estimate - self._stage_rss_before,
+                "top_lines": top,
+            }
+            self.records.append(record)
+        self._check_budget(record)
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        )
+
+    def _check_budget(self, record: dict):
+        budget = self.budgets.get(record["stage"])
+        if budget is not None and record["stage_growth"] > budget:
+            raise MemoryBudgetExceeded(record["stage"], record["step"], record["stage_growth"], budget)
+
+    def instrument(self, obj, prefix: str = None, methods=INSTRUMENTED_PREFIXES):
+        """
+        Wrap the pipeline-level methods of `obj` (on the instance) so each call is a step.
+
+        Args:
+            obj: The object to instrument, e.g. a DataCleaning instance.
+            prefix (str, optional): Step name prefix. Defaults to the class name.
+            methods (tuple, optional): Names or name prefixes of the methods to wrap.
+                Defaults to INSTRUMENTED_PREFIXES.
+
+        Returns:
+            The same object, instrumented.
+        """
+        prefix = prefix or type(obj).__name__
+        for attribute in dir(obj):
+            if not attribute.startswith(tuple(methods)):
+                continue
+            method = getattr(obj, attribute)
+            if not callable(method):
+                continue
+
+            def wrapper(*args, _method=method, _name=f"{prefix}.{attribute}", **kwargs):
+                with self.step(_name):
+                    return _method(*args, **kwargs)
+
+            setattr(obj, attribute, functools.wraps(method)(wrapper))
+        return obj
+
+    def report(self, path: str, top: int = 20):
+        """
+        Write the steps with the largest peak memory growth to `path`.
+
+        Args:
+            path (str): The report file to write.
+            top (int, optional): Number of steps to include. Defaults to 20.
+        """
+        mib = 1024 ** 2
+        ranked = sorted(self.records, key=lambda r: r["traced_peak_growth"], reverse=True)
+        with open(path, "w") as f:
+            f.write(f"{'step':<60}{'peak +MiB':>10}{'kept +MiB':>10}{'RSS after MiB':>15}\n")
+            for record in ranked[:top]:
+                f.write(
+                    f"{record['step']:<60}{record['traced_peak_growth'] / mib:>10.1f}"
+                    f"{record['traced_growth'] / mib:>10.1f}{record['rss_after'] / mib:>15.1f}\n"
+                )
+                for line in record["top_lines"]:
+                    f.write(f"    {line}\n")
+        print(f"Memory report written to {path}.")
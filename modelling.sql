@@ -68,23 +68,12 @@ ALTER TABLE dim_products
     ALTER COLUMN still_available TYPE BOOLEAN USING CASE WHEN still_available = 'true' THEN true ELSE false END,
     ALTER COLUMN weight_class TYPE VARCHAR(14) USING weight_class::VARCHAR(14);
 
--- Alter dim_date_times: add year, month, day, time
-ALTER TABLE dim_date_times
-    ADD COLUMN year INT,
-    ADD COLUMN month INT,
-    ADD COLUMN day INT,
-    ADD COLUMN time VARCHAR(8);
-
-UPDATE dim_date_times
-SET year = EXTRACT(YEAR FROM datetime),
-    month = EXTRACT(MONTH FROM datetime),
-    day = EXTRACT(DAY FROM datetime),
-    time = TO_CHAR(datetime, 'HH24:MI:SS');
-
+-- Alter dim_date_times: year, month, day and time are loaded by the pipeline
 ALTER TABLE dim_date_times
     ALTER COLUMN month TYPE VARCHAR(2),
     ALTER COLUMN year TYPE VARCHAR(4),
     ALTER COLUMN day TYPE VARCHAR(2),
+    ALTER COLUMN time TYPE VARCHAR(8),
     ALTER COLUMN time_period TYPE VARCHAR(10);
 
 ALTER TABLE dim_date_times
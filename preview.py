@@ -0,0 +1,133 @@
+# preview.py
+
+from typing import Optional
+
+import pandas as pd
+
+# Raw values the cleaning steps treat as missing (see DataCleaning.standardize_nulls).
+NULL_MARKERS = ['NULL', 'None', 'N/A', '']
+
+
+class PreviewSettings:
+    """
+    Bounds on how much of each source a preview run extracts.
+    """
+
+    def __init__(
+        self,
+        rows: int = 1000,
+        rds_sample_percent: float = 1.0,
+        pdf_pages: int = 2,
+        stores: int = 20,
+        s3_head_bytes: int = 256 * 1024
+    ):
+        """
+        Initialize the PreviewSettings.
+
+        Args:
+            rows (int, optional): Maximum number of rows per source. Defaults to 1000.
+            rds_sample_percent (float, optional): Percentage of RDS table pages sampled
+                with TABLESAMPLE. Defaults to 1.0.
+            pdf_pages (int, optional): Number of leading PDF pages read. Defaults to 2.
+            stores (int, optional): Number of leading store numbers fetched. Defaults to 20.
+            s3_head_bytes (int, optional): Number of leading bytes read from S3 objects.
+                Defaults to 256 KiB.
+        """
+        self.rows = rows
+        self.rds_sample_percent = rds_sample_percent
+        self.pdf_pages = pdf_pages
+        self.stores = stores
+        self.s3_head_bytes = s3_head_bytes
+
+    @classmethod
+    def from_config(cls, config) -> "PreviewSettings":
+        """
+        Build PreviewSettings from the [PREVIEW] section of config.ini, using the
+        defaults for anything not set.
+
+        Args:
+            config (configparser.ConfigParser): The parsed config.ini.
+
+        Returns:
+            PreviewSettings: The settings.
+        """
+        if not config.has_section("PREVIEW"):
+            return cls()
+        section = config["PREVIEW"]
+        return cls(
+            rows=section.getint("rows", 1000),
+            rds_sample_percent=section.getfloat("rds_sample_percent", 1.0),
+            pdf_pages=section.getint("pdf_pages", 2),
+            stores=section.getint("stores", 20),
+            s3_head_bytes=int(section.getfloat("s3_head_kilobytes", 256) * 1024),
+        )
+
+
+def column_stats(raw_df: Optional[pd.DataFrame], cleaned_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare the null rates of each column before and after cleaning.
+
+    Null markers such as 'NULL' and 'N/A' count as nulls in the raw data.
+    Columns that cleaning removed or added are flagged as such.
+
+    Args:
+        raw_df (pd.DataFrame or None): The sampled source data, if available.
+        cleaned_df (pd.DataFrame): The cleaned sample.
+
+    Returns:
+        pd.DataFrame: One row per column with its cleaned dtype, null counts and percentages
+                      ('-' where the column is absent).
+    """
+    raw_columns = list(raw_df.columns) if raw_df is not None else []
+    columns = raw_columns + [col for col in cleaned_df.columns if col not in raw_columns]
+
+    def nulls(df, col):
+        series = df[col]
+        return int((series.isna() | series.isin(NULL_MARKERS)).sum())
+
+    def percent(count, total):
+        return round(100 * count / total, 1) if total else 0.0
+
+    rows = []
+    for col in columns:
+        raw_nulls = nulls(raw_df, col) if col in raw_columns else None
+        clean_nulls = nulls(cleaned_df, col) if col in cleaned_df.columns else None
+        if col not in cleaned_df.columns:
+            status = "dropped"
+        elif raw_df is not None and col not in raw_columns:
+            status = "added"
+        else:
+            status = ""
+        rows.append({
+            "column": col,
+            "dtype": str(cleaned_df[col].dtype) if col in cleaned_df.columns else "-",
+            "raw_nulls": raw_nulls if raw_nulls is not None else "-",
+            "raw_null_%": percent(raw_nulls, len(raw_df)) if raw_nulls is not None else "-",
+            "clean_nulls": clean_nulls if clean_nulls is not None else "-",
+            "clean_null_%": percent(clean_nulls, len(cleaned_df)) if clean_nulls is not None else "-",
+            "status": status,
+        })
+    return pd.DataFrame(rows)
+
+
+def report_preview(table_name: str, raw_df: Optional[pd.DataFrame], cleaned_df: pd.DataFrame):
+    """
+    Print the row drop and column null statistics of a cleaned sample.
+
+    Args:
+        table_name (str): The destination table name.
+        raw_df (pd.DataFrame or None): The sampled source data, if available.
+        cleaned_df (pd.DataFrame): The cleaned sample.
+    """
+    if raw_df is not None:
+        dropped = len(raw_df) - len(cleaned_df)
+        dropped_percent = round(100 * dropped / len(raw_df), 1) if len(raw_df) else 0.0
+        print(
+            f"Preview of {table_name}: {len(raw_df)} sampled rows, {len(cleaned_df)} after cleaning "
+            f"({dropped} dropped, {dropped_percent}%)."
+        )
+    else:
+        print(f"Preview of {table_name}: {len(cleaned_df)} rows after cleaning.")
+
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(column_stats(raw_df, cleaned_df).to_string(index=False))
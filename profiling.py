@@ -0,0 +1,66 @@
+# profiling.py
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+@contextmanager
+def profile_stage(stage_name: str, output_dir: str, top: int = 25):
+    """
+    Profile the wrapped block with cProfile and tracemalloc.
+
+    If tracemalloc is already tracing (e.g. for the --memory monitor), it is left
+    running on exit, and the reported peak is the peak since it was last reset.
+
+    Writes to `output_dir`:
+        <stage>.prof        cProfile stats, loadable by snakeviz, flameprof or gprof2dot
+                            (e.g. `flameprof <stage>.prof > <stage>.svg` for a flamegraph).
+        <stage>.txt         The top functions by cumulative time.
+        <stage>.memory.txt  Peak traced memory and the top allocating source lines.
+
+    Args:
+        stage_name (str): Name of the stage, used for the output file names.
+        output_dir (str): Directory to write the profiles to. Created if missing.
+        top (int, optional): Number of entries to include in the text reports. Defaults to 25.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    base_path = os.path.join(output_dir, stage_name)
+
+    profiler = cProfile.Profile()
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+
+        profiler.dump_stats(f"{base_path}.prof")
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats("cumulative").print_stats(top)
+        with open(f"{base_path}.txt", "w") as f:
+            f.write(stream.getvalue())
+
+        with open(f"{base_path}.memory.txt", "w") as f:
+            f.write(f"Peak traced memory: {peak / 1024 ** 2:.1f} MiB\n\n")
+            for stat in snapshot.statistics("lineno")[:top]:
+                f.write(f"{stat}\n")
+
+        print(
+            f"Profiled stage {stage_name}: {elapsed:.2f}s, peak traced memory "
+            f"{peak / 1024 ** 2:.1f} MiB. Results written to {base_path}.*"
+        )
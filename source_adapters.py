@@ -0,0 +1,237 @@
+# source_adapters.py
+
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from data_extractor import DataExtractor
+from database_connector import DatabaseConnector
+from table_cache import TableCache
+
+SOURCE_ADAPTERS = {}
+
+
+def register_adapter(kind: str):
+    """
+    Class decorator registering a SourceAdapter subclass under `kind`, the value
+    used for `kind =` in a [FEED <name>] section of config.ini.
+
+    Args:
+        kind (str): The adapter kind.
+    """
+    def decorator(cls):
+        cls.kind = kind
+        SOURCE_ADAPTERS[kind] = cls
+        return cls
+    return decorator
+
+
+class SourceAdapter:
+    """
+    Base class for a configured data source.
+
+    Subclasses list the options their [FEED <name>] section must set in
+    `required_options`, and declare their capabilities so the feed scheduler can
+    decide how to run them:
+        supports_parallel: feeds of this kind may be extracted concurrently.
+        supports_chunking: extract_chunks() streams the source in bounded chunks.
+        supports_caching: extraction can be served from the local table cache.
+    """
+
+    kind = None
+    required_options = ()
+    supports_parallel = False
+    supports_chunking = False
+    supports_caching = False
+
+    def __init__(self, name: str, options: Dict[str, str]):
+        """
+        Initialize the adapter from its config.ini section.
+
+        Args:
+            name (str): The feed name.
+            options (dict): The adapter options of the [FEED <name>] section.
+        """
+        self.name = name
+        self.options = options
+
+    def _extractor(self, db_connector: DatabaseConnector = None) -> DataExtractor:
+        cache = None
+        if self.supports_caching and self.options.get("cache", "false").lower() == "true":
+            cache = TableCache(directory=self.options.get("cache_directory", ".cache/rds"))
+        return DataExtractor(db_connector, cache=cache)
+
+    def extract(self, limit: int = None) -> pd.DataFrame:
+        """
+        Extract the whole source.
+
+        Args:
+            limit (int, optional): Maximum number of rows. Defaults to None (all rows).
+
+        Returns:
+            pd.DataFrame: The raw data.
+        """
+        raise NotImplementedError
+
+    def extract_chunks(self, chunksize: int, limit: int = None) -> Iterator[pd.DataFrame]:
+        """
+        Extract the source in chunks. Adapters without chunking yield one chunk.
+
+        Args:
+            chunksize (int): Number of rows per chunk.
+            limit (int, optional): Maximum number of rows. Defaults to None (all rows).
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the raw data.
+        """
+        yield self.extract(limit=limit)
+
+
+@register_adapter("rds_table")
+class RdsTableAdapter(SourceAdapter):
+    """
+    A table in a Postgres database. Options: creds (YAML path), source_table.
+    """
+
+    required_options = ("creds", "source_table")
+    supports_parallel = True
+    supports_chunking = True
+    supports_caching = True
+
+    def _table_extractor(self) -> DataExtractor:
+        return self._extractor(DatabaseConnector(config_path=self.options["creds"]))
+
+    def extract(self, limit: int = None) -> pd.DataFrame:
+        return self._table_extractor().read_rds_table(self.options["source_table"], limit=limit)
+
+    def extract_chunks(self, chunksize: int, limit: int = None) -> Iterator[pd.DataFrame]:
+        yield from self._table_extractor().read_rds_table_chunks(
+            self.options["source_table"], chunksize=chunksize, limit=limit
+        )
+
+
+@register_adapter("pdf")
+class PdfAdapter(SourceAdapter):
+    """
+    Tables in a PDF file. Options: pdf_link. Not parallel: each read starts a JVM.
+    """
+
+    required_options = ("pdf_link",)
+
+    def extract(self, limit: int = None) -> pd.DataFrame:
+        data_extractor = self._extractor()
+        data_extractor.pdf_link = self.options["pdf_link"]
+        df = data_extractor.retrieve_pdf_data()
+        return df if limit is None else df.head(limit)
+
+
+@register_adapter("store_api")
+class StoreApiAdapter(SourceAdapter):
+    """
+    The store details API. Options: stores_endpoint, store_details_endpoint.
+    """
+
+    required_options = ("stores_endpoint", "store_details_endpoint")
+    supports_parallel = True
+
+    def extract(self, limit: int = None) -> pd.DataFrame:
+        data_extractor = self._extractor()
+        data_extractor.stores_endpoint = self.options["stores_endpoint"]
+        data_extractor.store_details_endpoint = self.options["store_details_endpoint"]
+        number_of_stores = data_extractor.list_number_of_stores()
+        if limit is not None:
+            number_of_stores = min(number_of_stores, limit)
+        payloads, _ = data_extractor.retrieve_store_payloads(range(number_of_stores))
+        return pd.DataFrame([payloads[n] for n in sorted(payloads)])
+
+
+@register_adapter("s3_csv")
+class S3CsvAdapter(SourceAdapter):
+    """
+    A CSV file in S3. Options: s3_uri, and parser = products for the typed products parse.
+    """
+
+    required_options = ("s3_uri",)
+    supports_parallel = True
+
+    def extract(self, limit: int = None) -> pd.DataFrame:
+        data_extractor = self._extractor()
+        data_extractor.s3_uri = self.options["s3_uri"]
+        if self.options.get("parser") == "products":
+            return data_extractor.extract_products_from_s3(limit=limit)
+        return data_extractor.extract_from_s3(limit=limit)
+
+
+@register_adapter("json_url")
+class JsonUrlAdapter(SourceAdapter):
+    """
+    A JSON document at a URL. Options: url.
+    """
+
+    required_options = ("url",)
+    supports_parallel = True
+
+    def extract(self, limit: int = None) -> pd.DataFrame:
+        df = self._extractor().extract_json_from_url(self.options["url"])
+        return df if limit is None else df.head(limit)
+
+
+class Feed:
+    """
+    One configured feed: a source adapter plus how its data is cleaned and loaded.
+    """
+
+    def __init__(self, name: str, adapter: SourceAdapter, table: str,
+                 cleaner: Optional[str] = None, chunksize: Optional[int] = None):
+        self.name = name
+        self.adapter = adapter
+        self.table = table
+        self.cleaner = cleaner
+        self.chunksize = chunksize
+
+
+def load_feeds(config) -> List[Feed]:
+    """
+    Build the feeds defined by the [FEED <name>] sections of config.ini.
+
+    Each section needs `kind` (a registered adapter kind) and `table` (the
+    destination table), and may set `cleaner` (a DataCleaning method name) and
+    `chunksize` (for adapters that support chunking). The remaining options go
+    to the adapter, e.g. `source_table` for an rds_table feed.
+
+    Args:
+        config (configparser.ConfigParser): The parsed config.ini.
+
+    Returns:
+        list: The configured feeds, in config order.
+    """
+    feeds = []
+    for section in config.sections():
+        if not section.startswith("FEED "):
+            continue
+        name = section[len("FEED "):].strip()
+        options = dict(config[section])
+        kind = options.pop("kind", None)
+        table = options.pop("table", None)
+        cleaner = options.pop("cleaner", None)
+        chunksize = options.pop("chunksize", None)
+        if kind not in SOURCE_ADAPTERS:
+            print(f"Skipping feed {name}: unknown source kind {kind!r}.")
+            continue
+        if table is None:
+            print(f"Skipping feed {name}: no destination table.")
+            continue
+        adapter_cls = SOURCE_ADAPTERS[kind]
+        missing = [option for option in adapter_cls.required_options if option not in options]
+        if missing:
+            print(f"Skipping feed {name}: missing {kind} option(s) {', '.join(missing)}.")
+            continue
+        adapter = adapter_cls(name, dict(options))
+        feeds.append(Feed(
+            name,
+            adapter,
+            table=table,
+            cleaner=cleaner,
+            chunksize=int(chunksize) if chunksize and adapter.supports_chunking else None,
+        ))
+    return feeds
@@ -0,0 +1,124 @@
+# store_snapshot.py
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable
+
+
+class StoreSnapshotStore:
+    """
+    Keeps the last known store details payload per store number, together with
+    a content hash, so that runs can tell which stores actually changed.
+    """
+
+    def __init__(self, path: str = "store_snapshots.json"):
+        """
+        Initialize the StoreSnapshotStore and load any existing snapshot file.
+
+        Args:
+            path (str, optional):
+                Path to the JSON file holding the snapshots.
+                Defaults to "store_snapshots.json".
+        """
+        self.path = path
+        self.snapshots = self._load()
+
+    def _load(self) -> Dict[int, Dict[str, Any]]:
+        """
+        Load the snapshots from disk.
+
+        Returns:
+            dict: A mapping of store number to {'hash', 'payload'},
+                  or an empty dict if the file is missing or unreadable.
+        """
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, "r") as f:
+                raw = json.load(f)
+            return {int(store_number): entry for store_number, entry in raw.items()}
+        except (OSError, ValueError) as e:
+            print(f"Error reading store snapshots from {self.path}: {e}")
+            return {}
+
+    @staticmethod
+    def hash_payload(payload: Dict[str, Any]) -> str:
+        """
+        Compute a stable content hash of a store payload.
+
+        Args:
+            payload (dict): The store details payload returned by the API.
+
+        Returns:
+            str: The hex SHA-256 digest of the canonical JSON encoding.
+        """
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def diff(self, payloads: Dict[int, Dict[str, Any]], number_of_stores: int) -> Dict[str, list]:
+        """
+        Compare freshly fetched payloads against the stored snapshots.
+
+        Store numbers that could not be fetched are simply absent from
+        `payloads`; they are neither reported as changed nor as removed.
+
+        Args:
+            payloads (dict): Mapping of store number to fetched payload.
+            number_of_stores (int): The current number of stores reported by the API.
+
+        Returns:
+            dict: Lists of store numbers under 'new', 'changed', 'unchanged' and 'removed'.
+        """
+        delta = {"new": [], "changed": [], "unchanged": [], "removed": []}
+
+        for store_number, payload in sorted(payloads.items()):
+            previous = self.snapshots.get(store_number)
+            if previous is None:
+                delta["new"].append(store_number)
+            elif previous["hash"] != self.hash_payload(payload):
+                delta["changed"].append(store_number)
+            else:
+                delta["unchanged"].append(store_number)
+
+        delta["removed"] = sorted(n for n in self.snapshots if n >= number_of_stores)
+        return delta
+
+    def previous_payload(self, store_number: int) -> Dict[str, Any]:
+        """
+        Return the last known payload for a store number.
+
+        Args:
+            store_number (int): The store number to look up.
+
+        Returns:
+            dict: The stored payload, or an empty dict if none is known.
+        """
+        entry = self.snapshots.get(store_number)
+        return entry["payload"] if entry else {}
+
+    def update(self, payloads: Dict[int, Dict[str, Any]], removed: Iterable[int] = ()):
+        """
+        Record new payloads and forget removed store numbers.
+
+        Args:
+            payloads (dict): Mapping of store number to fetched payload.
+            removed (Iterable[int], optional): Store numbers to drop from the snapshot.
+        """
+        for store_number, payload in payloads.items():
+            self.snapshots[store_number] = {
+                "hash": self.hash_payload(payload),
+                "payload": payload,
+            }
+        for store_number in removed:
+            self.snapshots.pop(store_number, None)
+
+    def save(self):
+        """
+        Write the snapshots to disk atomically.
+        """
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({str(n): entry for n, entry in self.snapshots.items()}, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,297 @@
+# table_cache.py
+
+import importlib.util
+import json
+import os
+import threading
+import time
+from typing import Iterator, Optional
+
+import pandas as pd
+
+
+class TableCache:
+    """
+    Local Parquet cache of whole tables. Each table is stored under a key naming
+    its database and schema, with the source fingerprint it was read at.
+
+    A cached table is served only while its fingerprint matches the source and
+    it is younger than the TTL. The cache is bounded in size; least recently
+    used tables are evicted first.
+    """
+
+    def __init__(
+        self,
+        directory: str = ".cache/rds",
+        ttl_seconds: float = 86400,
+        max_bytes: int = 2 * 1024 ** 3
+    ):
+        """
+        Initialize the TableCache.
+
+        Args:
+            directory (str, optional): Directory holding the cache files. Defaults to ".cache/rds".
+            ttl_seconds (float, optional): Maximum age of a cached table. Defaults to one day.
+            max_bytes (int, optional): Maximum total size of cached tables. Defaults to 2 GiB.
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        # pyarrow is imported by the reads and writes that need it, not here.
+        self.enabled = importlib.util.find_spec("pyarrow") is not None
+        if not self.enabled:
+            print("pyarrow is not installed; the table cache is disabled.")
+
+    @classmethod
+    def from_config(cls, config) -> Optional["TableCache"]:
+        """
+        Build a TableCache from the [CACHE] section of config.ini.
+
+        Args:
+            config (configparser.ConfigParser): The parsed config.ini.
+
+        Returns:
+            TableCache or None: A cache if enabled in config.ini, otherwise None.
+        """
+        if not config.has_section("CACHE") or not config["CACHE"].getboolean("enabled", False):
+            return None
+        section = config["CACHE"]
+        return cls(
+            directory=section.get("directory", ".cache/rds"),
+            ttl_seconds=section.getfloat("ttl_seconds", 86400),
+            max_bytes=int(section.getfloat("max_megabytes", 2048) * 1024 ** 2),
+        )
+
+    def _paths(self, key: str) -> tuple:
+        base = os.path.join(self.directory, key)
+        return f"{base}.parquet", f"{base}.json"
+
+    def _fresh_meta_path(self, key: str, fingerprint: str) -> Optional[str]:
+        """
+        Return the metadata path of a cached table that matches the fingerprint and
+        has not expired, or None.
+        """
+        if not self.enabled or fingerprint is None:
+            return None
+
+        _, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("fingerprint") != fingerprint:
+            return None
+        if time.time() - meta.get("created", 0) > self.ttl_seconds:
+            return None
+        return meta_path
+
+    def get(self, key: str, fingerprint: str) -> Optional[pd.DataFrame]:
+        """
+        Return the cached table if its fingerprint matches and it has not expired.
+
+        Args:
+            key (str): Cache key of the source table, see DataExtractor.table_cache_identity.
+            fingerprint (str): The current source fingerprint.
+
+        Returns:
+            pd.DataFrame or None: The cached table, or None on a miss.
+        """
+        meta_path = self._fresh_meta_path(key, fingerprint)
+        if meta_path is None:
+            return None
+
+        data_path, _ = self._paths(key)
+        try:
+            df = pd.read_parquet(data_path)
+        except Exception as e:
+            print(f"Error reading cached table {key}: {e}")
+            return None
+
+        # The metadata mtime doubles as the last-access time for LRU eviction.
+        os.utime(meta_path)
+        print(f"Serving {key} from cache ({len(df)} rows).")
+        return df
+
+    def get_chunks(self, key: str, fingerprint: str, chunksize: int) -> Optional[Iterator[pd.DataFrame]]:
+        """
+        Return the cached table as an iterator of chunks read one Parquet batch at a
+        time, if its fingerprint matches and it has not expired.
+
+        Args:
+            key (str): Cache key of the source table, see DataExtractor.table_cache_identity.
+            fingerprint (str): The current source fingerprint.
+            chunksize (int): Number of rows per chunk.
+
+        Returns:
+            Iterator[pd.DataFrame] or None: The cached chunks, or None on a miss.
+        """
+        meta_path = self._fresh_meta_path(key, fingerprint)
+        if meta_path is None:
+            return None
+
+        data_path, _ = self._paths(key)
+        try:
+            import pyarrow.parquet as pq
+            parquet_file = pq.ParquetFile(data_path)
+        except Exception as e:
+            print(f"Error reading cached table {key}: {e}")
+            return None
+
+        os.utime(meta_path)
+        print(f"Serving {key} from cache ({parquet_file.metadata.num_rows} rows).")
+        return (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunksize))
+
+    def put(self, key: str, fingerprint: str, df: pd.DataFrame):
+        """
+        Cache a table under its fingerprint, then evict tables over the size bound.
+
+        Args:
+            key (str): Cache key of the source table, see DataExtractor.table_cache_identity.
+            fingerprint (str): The source fingerprint the table was read at.
+            df (pd.DataFrame): The table data.
+        """
+        if not self.enabled or fingerprint is None:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            tmp_path = self._tmp_path(key)
+            df.to_parquet(tmp_path, index=False)
+            self._publish(key, fingerprint, tmp_path)
+        except Exception as e:
+            print(f"Error caching table {key}: {e}")
+            return
+
+        self._evict()
+
+    def writer(self, key: str, fingerprint: str) -> Optional["TableCacheWriter"]:
+        """
+        Start caching a table that is read in chunks.
+
+        Args:
+            key (str): Cache key of the source table, see DataExtractor.table_cache_identity.
+            fingerprint (str): The source fingerprint the table is read at.
+
+        Returns:
+            TableCacheWriter or None: A writer for the chunks, or None if the cache is disabled.
+        """
+        if not self.enabled or fingerprint is None:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        return TableCacheWriter(self, key, fingerprint)
+
+    def _tmp_path(self, key: str) -> str:
+        # Private to the writing thread, so concurrent reads of one table cannot
+        # interleave their writes.
+        return f"{self._paths(key)[0]}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+    def _publish(self, key: str, fingerprint: str, tmp_path: str):
+        """
+        Move a fully written temporary Parquet file into place and record its fingerprint.
+        """
+        data_path, meta_path = self._paths(key)
+        os.replace(tmp_path, data_path)
+        with open(meta_path, "w") as f:
+            json.dump({"fingerprint": fingerprint, "created": time.time()}, f)
+
+    def _evict(self):
+        """
+        Delete least recently used tables until the cache fits in max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            meta_path = os.path.join(self.directory, name)
+            data_path = meta_path[:-len(".json")] + ".parquet"
+            size = os.path.getsize(data_path) if os.path.exists(data_path) else 0
+            entries.append((os.path.getmtime(meta_path), size, data_path, meta_path))
+
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, data_path, meta_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (data_path, meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+
+
+class TableCacheWriter:
+    """
+    Writes a table to the cache one chunk at a time, each chunk a Parquet row
+    group, so a streamed read fills the cache without holding the whole table.
+
+    The table is only published to the cache by `commit`, after every chunk has
+    been written; a partial or failed write is discarded.
+    """
+
+    def __init__(self, cache: TableCache, key: str, fingerprint: str):
+        """
+        Initialize the TableCacheWriter.
+
+        Args:
+            cache (TableCache): The cache to write to.
+            key (str): Cache key of the source table, see DataExtractor.table_cache_identity.
+            fingerprint (str): The source fingerprint the table is read at.
+        """
+        self.cache = cache
+        self.key = key
+        self.fingerprint = fingerprint
+        self.tmp_path = cache._tmp_path(key)
+        self._writer = None
+
+    def write(self, df: pd.DataFrame) -> bool:
+        """
+        Append one chunk. Chunks whose columns cannot be cast to the types of the
+        first chunk (e.g. a column that was all null in it) abandon the write.
+
+        Args:
+            df (pd.DataFrame): The chunk.
+
+        Returns:
+            bool: True if the chunk was written, False if caching was abandoned.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.tmp_path, table.schema)
+            elif not table.schema.equals(self._writer.schema):
+                table = table.cast(self._writer.schema)
+            self._writer.write_table(table)
+            return True
+        except Exception as e:
+            print(f"Error caching table {self.key}: {e}")
+            self.abort()
+            return False
+
+    def commit(self):
+        """
+        Publish the written chunks to the cache, then evict tables over the size bound.
+        """
+        if self._writer is None:
+            return
+        try:
+            self._writer.close()
+            self._writer = None
+            self.cache._publish(self.key, self.fingerprint, self.tmp_path)
+        except Exception as e:
+            print(f"Error caching table {self.key}: {e}")
+            self.abort()
+            return
+        self.cache._evict()
+
+    def abort(self):
+        """
+        Discard the chunks written so far.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)